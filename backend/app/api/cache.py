@@ -0,0 +1,49 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Type
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import BaseModel
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.replicas import reading_from_replica, reads_pinned_to_primary
+from app.schemas.adapters import dump_json
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+async def cached_response(
+    request: Request,
+    model: Type[BaseModel],
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve a public GET from the response cache, honouring If-None-Match.
+
+    ``build`` is only awaited on a miss; its result is validated against
+    ``model`` and serialized once, then reused until the next content write.
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    key = f"{request.url.path}?{query}"
+
+    # A client that just wrote reads from the primary; a cached body may
+    # predate its write or have been built from a lagging replica
+    entry = None if reads_pinned_to_primary() else response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        data = await build()
+        body = dump_json(model, data)
+        etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        entry = (etag, body)
+        response_cache.set(key, generation, entry, from_replica=reading_from_replica())
+
+    etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": settings.RESPONSE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
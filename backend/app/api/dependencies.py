@@ -1,17 +1,26 @@
-from fastapi import Depends, HTTPException, status
+from time import time
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.database import get_db
-from app.schemas.user import TokenData
+from app.core.database import DBSession, get_session, run_crud
+from app.core.ratelimit import rate_limiter
+from app.schemas.user import TokenData, User
 from app.crud.user import get_user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+    db: DBSession = Depends(get_session), token: str = Depends(oauth2_scheme)
 ):
+    # Warm tokens skip both the JWT decode and the user lookup
+    cached_user = principal_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
+    # Loaded on first use, see app.core.security
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,7 +38,46 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = get_user(db, user_id=token_data.user_id)
+    user = await run_crud(db, get_user, user_id=token_data.user_id)
     if user is None:
         raise credentials_exception
-    return user
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+
+    current_user = User.model_validate(user)
+    principal_cache.set(token, current_user.id, current_user, payload.get("exp", 0) - time())
+    return current_user
+
+def client_ip(request: Request) -> str:
+    # Only trust X-Forwarded-For behind a proxy that sets it
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+async def limit_auth_by_ip(request: Request):
+    await rate_limiter.hit(
+        f"auth:ip:{client_ip(request)}",
+        settings.AUTH_RATE_LIMIT_IP_PER_MINUTE,
+        settings.AUTH_RATE_LIMIT_IP_BURST,
+    )
+
+async def limit_auth_by_username(username: str):
+    # Called before any Argon2 work, so a stuffing run against one account
+    # is cut off even when spread over many addresses
+    await rate_limiter.hit(
+        f"auth:username:{username.lower()}",
+        settings.AUTH_RATE_LIMIT_USERNAME_PER_MINUTE,
+        settings.AUTH_RATE_LIMIT_USERNAME_BURST,
+    )
+
+async def limit_export(current_user: User = Depends(get_current_user)) -> User:
+    await rate_limiter.hit(
+        f"export:user:{current_user.id}",
+        settings.EXPORT_RATE_LIMIT_PER_MINUTE,
+        settings.EXPORT_RATE_LIMIT_BURST,
+    )
+    return current_user
@@ -1,50 +1,65 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.api.dependencies import limit_auth_by_ip, limit_auth_by_username
+from app.api.responses import model_response
+from app.core.database import DBSession, get_session, run_crud
 from app.core.config import settings
-from app.core.security import create_access_token
-from app.crud.user import authenticate_user, create_user, get_user
+from app.core.security import create_access_token, password_hasher
+from app.crud.user import create_user, get_user, update_password_hash
 from app.schemas.user import Token, UserCreate, User
 
-router = APIRouter()
+# Every auth route costs an Argon2 computation, so all of them are throttled
+router = APIRouter(dependencies=[Depends(limit_auth_by_ip)])
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_session)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+    await limit_auth_by_username(form_data.username)
+    user = await run_crud(db, get_user, username=form_data.username)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently upgrade hashes made with outdated Argon2 parameters
+    if new_hash:
+        user = await run_crud(db, update_password_hash, user, new_hash)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username, "id": user.id},
         expires_delta=access_token_expires
     )
     
-    return {"access_token": access_token, "token_type": "bearer", "user": user}
+    return model_response(Token, Token(access_token=access_token, token_type="bearer"))
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user_by_email = get_user(db, email=user.email)
+async def register_user(user: UserCreate, db: DBSession = Depends(get_session)):
+    await limit_auth_by_username(user.username)
+    db_user_by_email = await run_crud(db, get_user, email=user.email)
     if db_user_by_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    db_user_by_username = get_user(db, username=user.username)
+    db_user_by_username = await run_crud(db, get_user, username=user.username)
     if db_user_by_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    return create_user(db=db, user=user)
+    hashed_password = await password_hasher.hash(user.password)
+    created = await run_crud(db, create_user, user=user, hashed_password=hashed_password)
+    return model_response(User, created, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from app.core.config import settings
+from app.core.database import async_pool_metrics, get_async_engine, get_engine, get_replicas, pool_metrics
+from app.core.instrumentation import route_metrics
+from app.core.jobs import job_queue
+from app.core.ratelimit import rate_limiter
+from app.core.related import related_index
+from app.core.security import password_hasher
+
+router = APIRouter()
+
+@router.get("/")
+async def read_metrics():
+    metrics = {
+        "routes": route_metrics.snapshot(),
+        "database_pool": pool_metrics.stats(get_engine().pool),
+        "password_hasher": password_hasher.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "related_posts_index": related_index.stats(),
+        "background_jobs": job_queue.stats(),
+    }
+    if settings.DATABASE_ASYNC:
+        metrics["async_database_pool"] = async_pool_metrics.stats(get_async_engine().sync_engine.pool)
+    replicas = get_replicas()
+    if replicas is not None:
+        metrics["database_replicas"] = replicas.stats()
+    return metrics
@@ -1,67 +1,245 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Optional
-
-from app.api.dependencies import get_current_user
-from app.core.database import get_db
-from app.crud.post import get_post, get_posts, create_post, update_post, delete_post
-from app.schemas.post import Post, PostCreate, PostUpdate, PostList
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+
+from app.api.cache import cached_response
+from app.api.dependencies import get_current_user, limit_export
+from app.api.export import ExportFormat, export_response
+from app.api.responses import model_response
+from app.api.ndjson import iter_lines
+from app.api.related import ensure_related_index
+from app.core.config import settings
+from app.core.database import DBSession, get_read_session, get_session, run_crud
+from app.core.ids import InputId
+from app.crud.post import (
+    get_post, get_posts, get_related_posts, search_posts, create_post, import_posts, update_post,
+    delete_post, bulk_delete_posts, bulk_update_posts, derive_content_fields,
+)
+from app.schemas.post import (
+    Post, PostCreate, PostUpdate, PostList, PostSummary, PostSummaryList, PostSearchList,
+    PostImportError, PostImportResult, PostBulkDelete, PostBulkUpdate, PostBulkResult,
+)
 from app.schemas.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-@router.get("/", response_model=PostList)
+@router.get("/", response_model=Union[PostList, PostSummaryList])
 async def read_posts(
-    page: int = 1, 
-    limit: int = 10,
+    request: Request,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
     sort: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    match: Literal["any", "all"] = "any",
+    view: Literal["full", "summary"] = "full",
+    count: Literal["exact", "estimated", "none"] = "exact",
+    db: DBSession = Depends(get_read_session)
 ):
     skip = (page - 1) * limit
-    posts = get_posts(db, skip=skip, limit=limit)
-    return posts
+
+    async def load():
+        try:
+            return await run_crud(
+                db, get_posts, skip=skip, limit=limit, cursor=cursor, sort=sort,
+                tags=tag, match_all=match == "all", summary=view == "summary", count=count,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            )
+
+    model = PostSummaryList if view == "summary" else PostList
+    return await cached_response(request, model, load)
 
 @router.post("/", response_model=Post, status_code=status.HTTP_201_CREATED)
 async def create_post_endpoint(
     post: PostCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    # Rendering is CPU-bound; keep it off the event loop (see run_crud)
+    derived = await run_in_threadpool(derive_content_fields, post.content, post.excerpt)
+    created = await run_crud(db, create_post, post=post, user_id=current_user.id, derived=derived)
+    return model_response(Post, created, status_code=status.HTTP_201_CREATED)
+
+def _derive_all(posts: List[PostCreate]) -> List[dict]:
+    return [derive_content_fields(post.content, post.excerpt) for post in posts]
+
+def _describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'line'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+@router.post("/import", response_model=PostImportResult)
+async def import_posts_endpoint(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Import posts from a streamed NDJSON body, one ``PostCreate`` per line.
+
+    Lines are validated as they arrive and inserted in batches of
+    ``batch_size``, each batch in its own transaction. Invalid lines are
+    skipped and reported by line number; the rest still go in.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    imported = 0
+    errors: List[PostImportError] = []
+    batch: List[PostCreate] = []
+    batch_lines: List[int] = []
+
+    async def flush():
+        nonlocal imported
+        try:
+            derived = await run_in_threadpool(_derive_all, batch)
+            imported += len(await run_crud(db, import_posts, batch, current_user.id, derived))
+        except SQLAlchemyError:
+            logger.exception("post import batch failed", extra={"user_id": current_user.id, "lines": len(batch)})
+            errors.extend(PostImportError(line=line, error="Batch insert failed") for line in batch_lines)
+
+    async for line_number, line in iter_lines(request.stream(), settings.IMPORT_MAX_LINE_BYTES):
+        if line is None:
+            errors.append(PostImportError(
+                line=line_number, error=f"Line exceeds {settings.IMPORT_MAX_LINE_BYTES} bytes"
+            ))
+            continue
+        try:
+            batch.append(PostCreate.model_validate_json(line))
+        except ValidationError as e:
+            errors.append(PostImportError(line=line_number, error=_describe_validation_error(e)))
+            continue
+        batch_lines.append(line_number)
+        if len(batch) >= batch_size:
+            await flush()
+            batch, batch_lines = [], []
+    if batch:
+        await flush()
+
+    return model_response(PostImportResult, PostImportResult(imported=imported, failed=len(errors), errors=errors))
+
+def _bulk_result(outcomes: dict) -> PostBulkResult:
+    return PostBulkResult(results=[{"id": post_id, "status": outcome} for post_id, outcome in outcomes.items()])
+
+@router.post("/bulk-delete", response_model=PostBulkResult)
+async def bulk_delete_posts_endpoint(
+    payload: PostBulkDelete,
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete up to 500 posts in one transaction; other users' posts are skipped."""
+    outcomes = await run_crud(db, bulk_delete_posts, payload.ids, current_user.id)
+    return model_response(PostBulkResult, _bulk_result(outcomes))
+
+@router.post("/bulk-update", response_model=PostBulkResult)
+async def bulk_update_posts_endpoint(
+    changes: PostBulkUpdate,
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    return create_post(db=db, post=post, user_id=current_user.id)
+    """Apply the same field and tag changes to up to 500 posts in one transaction."""
+    outcomes = await run_crud(db, bulk_update_posts, changes, current_user.id)
+    return model_response(PostBulkResult, _bulk_result(outcomes))
+
+@router.get("/search", response_model=PostSearchList)
+async def search_posts_endpoint(
+    q: str,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    db: DBSession = Depends(get_read_session)
+):
+    skip = (page - 1) * limit
+    return model_response(PostSearchList, await run_crud(db, search_posts, q, skip=skip, limit=limit))
+
+@router.get("/export")
+async def export_posts_endpoint(
+    format: ExportFormat = "ndjson",
+    author: Optional[InputId] = None,
+    tag: Optional[List[str]] = Query(None),
+    match: Literal["any", "all"] = "any",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    gzip: bool = False,
+    current_user: User = Depends(limit_export),
+):
+    """Stream matching posts, oldest first, as NDJSON or a JSON array.
+
+    ``since`` is inclusive and ``until`` exclusive on ``published_at``. With
+    ``gzip=true`` the body is compressed on the fly (Content-Encoding: gzip).
+    Requires a login, is rate limited per user and stops after
+    ``EXPORT_MAX_ROWS`` posts.
+    """
+    return export_response(
+        format, gzip, author_id=author, tags=tag, match_all=match == "all", since=since, until=until,
+    )
 
 @router.get("/{post_id}", response_model=Post)
-async def read_post(post_id: str, db: Session = Depends(get_db)):
-    # Try to find by ID first
-    post = get_post(db, post_id=post_id)
-    
-    if post is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
-        )
-    return post
+async def read_post(post_id: InputId, request: Request, db: DBSession = Depends(get_read_session)):
+    async def load():
+        post = await run_crud(db, get_post, post_id=post_id)
+        if post is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+            )
+        return post
+
+    return await cached_response(request, Post, load)
+
+@router.get("/{post_id}/related", response_model=List[PostSummary])
+async def read_related_posts(
+    post_id: InputId,
+    request: Request,
+    limit: int = Query(5, ge=1, le=20),
+    db: DBSession = Depends(get_read_session),
+):
+    """Posts sharing the most (and rarest) tags with this one, newer first among equals."""
+    async def load():
+        await ensure_related_index()
+        posts = await run_crud(db, get_related_posts, post_id, limit)
+        if posts is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Post not found"
+            )
+        return posts
+
+    return await cached_response(request, List[PostSummary], load)
 
 @router.patch("/{post_id}", response_model=Post)
 async def update_post_endpoint(
-    post_id: str,
+    post_id: InputId,
     post_update: PostUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    updated_post = update_post(db, post_id=post_id, post_update=post_update, user_id=current_user.id)
+    derived = None
+    if post_update.content is not None:
+        # Wasted if the body turns out unchanged, but it can't run on the loop
+        derived = await run_in_threadpool(derive_content_fields, post_update.content, post_update.excerpt)
+    updated_post = await run_crud(
+        db, update_post, post_id=post_id, post_update=post_update, user_id=current_user.id, derived=derived,
+    )
     if updated_post is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found or you don't have permission to update it"
         )
-    return updated_post
+    return model_response(Post, updated_post)
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post_endpoint(
-    post_id: str,
-    db: Session = Depends(get_db),
+    post_id: InputId,
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    success = delete_post(db, post_id=post_id, user_id=current_user.id)
+    success = await run_crud(db, delete_post, post_id=post_id, user_id=current_user.id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,12 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from app.api.responses import model_response
+from app.core.database import DBSession, get_read_session, run_crud
+from app.crud.post import get_tags
+from app.schemas.post import TagWithCount
+
+router = APIRouter()
+
+@router.get("/", response_model=List[TagWithCount])
+async def read_tags(limit: int = Query(100, ge=1, le=500), db: DBSession = Depends(get_read_session)):
+    return model_response(List[TagWithCount], await run_crud(db, get_tags, limit=limit))
@@ -1,42 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import Literal, Optional, Union
+from app.api.cache import cached_response
 from app.api.dependencies import get_current_user
-from app.core.database import get_db
+from app.api.responses import model_response
+from app.core.database import DBSession, get_read_session, get_session, run_crud
+from app.core.ids import InputId
+from app.core.security import password_hasher
 from app.crud.user import get_user, update_user
 from app.crud.post import get_posts_by_user
 from app.schemas.user import User, UserUpdate
-from app.schemas.post import PostList
+from app.schemas.post import PostList, PostSummaryList
 
 router = APIRouter()
 
 @router.get("/me", response_model=User)
 async def read_users_me(current_user: User = Depends(get_current_user)):
-    return current_user
+    return model_response(User, current_user)
 
 @router.patch("/me", response_model=User)
 async def update_user_me(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    return update_user(db, current_user.id, user_update)
+    hashed_password = None
+    if user_update.password is not None:
+        hashed_password = await password_hasher.hash(user_update.password)
+    updated = await run_crud(db, update_user, current_user.id, user_update, hashed_password)
+    return model_response(User, updated)
 
 @router.get("/{user_id}", response_model=User)
-async def read_user(user_id: str, db: Session = Depends(get_db)):
-    db_user = get_user(db, user_id=user_id)
-    if db_user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-        )
-    return db_user
-
-@router.get("/{user_id}/posts", response_model=PostList)
+async def read_user(user_id: InputId, request: Request, db: DBSession = Depends(get_read_session)):
+    async def load():
+        db_user = await run_crud(db, get_user, user_id=user_id)
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        return db_user
+
+    return await cached_response(request, User, load)
+
+@router.get("/{user_id}/posts", response_model=Union[PostList, PostSummaryList])
 async def read_user_posts(
-    user_id: str, 
-    page: int = 1, 
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    user_id: InputId,
+    request: Request,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: Literal["full", "summary"] = "full",
+    count: Literal["exact", "estimated", "none"] = "exact",
+    db: DBSession = Depends(get_read_session)
 ):
     skip = (page - 1) * limit
-    posts = get_posts_by_user(db, user_id=user_id, skip=skip, limit=limit)
-    return posts
+
+    async def load():
+        try:
+            return await run_crud(
+                db, get_posts_by_user, user_id=user_id, skip=skip, limit=limit,
+                cursor=cursor, summary=view == "summary", count=count,
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            )
+
+    model = PostSummaryList if view == "summary" else PostList
+    return await cached_response(request, model, load)
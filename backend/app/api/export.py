@@ -0,0 +1,92 @@
+import zlib
+from typing import AsyncIterator, Iterator, Literal, Optional
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.database import get_async_read_sessionmaker, get_read_sessionmaker
+from app.crud.post import export_posts, export_posts_statement, release_posts
+from app.schemas.adapters import dump_json
+from app.schemas.post import Post
+
+ExportFormat = Literal["ndjson", "json"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+# Serialized posts are coalesced into writes of roughly this size
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportWriter:
+    """Frames serialized posts as NDJSON or a JSON array, optionally gzipped.
+
+    Output is buffered into ``CHUNK_SIZE`` pieces so the response isn't one
+    tiny write (and one gzip flush) per post.
+    """
+
+    def __init__(self, format: ExportFormat, compress: bool = False):
+        self.format = format
+        self._buffer = bytearray(b"[" if format == "json" else b"")
+        self._first = True
+        # wbits=31 writes a gzip header and trailer
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def write(self, post) -> Optional[bytes]:
+        item = dump_json(Post, post)
+        if self.format == "json":
+            if not self._first:
+                self._buffer += b","
+            self._buffer += item
+        else:
+            self._buffer += item + b"\n"
+        self._first = False
+        if len(self._buffer) >= CHUNK_SIZE:
+            return self._drain()
+        return None
+
+    def close(self) -> bytes:
+        if self.format == "json":
+            self._buffer += b"]"
+        data = self._drain()
+        if self._compressor is not None:
+            data += self._compressor.flush()
+        return data
+
+    def _drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        return data
+
+
+def _sync_chunks(writer: ExportWriter, filters: dict) -> Iterator[bytes]:
+    # Starlette pulls each chunk on the threadpool; the session lives as
+    # long as the response body does, not just the request handler
+    with get_read_sessionmaker()() as db:
+        for batch in export_posts(db, **filters):
+            for post in batch:
+                chunk = writer.write(post)
+                if chunk:
+                    yield chunk
+    yield writer.close()
+
+
+async def _async_chunks(writer: ExportWriter, filters: dict) -> AsyncIterator[bytes]:
+    async with get_async_read_sessionmaker()() as db:
+        result = await db.stream_scalars(export_posts_statement(**filters))
+        async for batch in result.partitions():
+            for post in batch:
+                chunk = writer.write(post)
+                if chunk:
+                    yield chunk
+            release_posts(db.sync_session, batch)
+    yield writer.close()
+
+
+def export_response(format: ExportFormat, compress: bool, **filters) -> StreamingResponse:
+    """Stream every post matching ``filters`` (see ``export_posts_statement``)."""
+    writer = ExportWriter(format, compress)
+    chunks = _async_chunks(writer, filters) if settings.DATABASE_ASYNC else _sync_chunks(writer, filters)
+    headers = {"Content-Disposition": f'attachment; filename="posts.{format}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers=headers)
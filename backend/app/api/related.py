@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import get_async_sessionmaker, get_sessionmaker
+from app.core.related import related_index
+from app.crud.post import load_related_index
+
+logger = logging.getLogger(__name__)
+
+_rebuild_lock = asyncio.Lock()
+
+
+def _rebuild_sync() -> None:
+    with get_sessionmaker()() as db:
+        load_related_index(db)
+
+
+async def _rebuild() -> None:
+    # Always read from the primary; a lagging replica would drop recent posts
+    if settings.DATABASE_ASYNC:
+        async with get_async_sessionmaker()() as db:
+            await db.run_sync(load_related_index)
+    else:
+        await run_in_threadpool(_rebuild_sync)
+
+
+async def rebuild_related_index() -> None:
+    async with _rebuild_lock:
+        await _rebuild()
+
+
+async def ensure_related_index() -> None:
+    """Build the index on first use."""
+    if not related_index.ready:
+        async with _rebuild_lock:
+            if not related_index.ready:
+                await _rebuild()
+
+
+async def refresh_related_index() -> None:
+    # Each worker's index only follows its own writes; rebuilding picks up
+    # posts written by the others. One nothing has asked for yet is left to
+    # ensure_related_index
+    while True:
+        await asyncio.sleep(settings.RELATED_POSTS_REFRESH_SECONDS)
+        if not related_index.ready:
+            continue
+        try:
+            await rebuild_related_index()
+        except Exception:
+            logger.exception("related posts index refresh failed")
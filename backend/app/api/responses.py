@@ -0,0 +1,32 @@
+from typing import Any, Mapping, Optional
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from app.schemas.adapters import dump_json
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class for routes without a response model."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(
+    tp: Any,
+    data: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serialize ``data`` as ``tp`` once and return it as-is.
+
+    Returning a Response bypasses FastAPI's own response-model validation
+    and encoding; the route's ``response_model`` is kept for the OpenAPI
+    schema only.
+    """
+    return Response(
+        content=dump_json(tp, data),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
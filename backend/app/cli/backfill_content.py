@@ -0,0 +1,69 @@
+"""Fill in derived post columns (HTML, excerpt, word count, reading time).
+
+Run once after migrating to d7f3b1c8e4a6 or b2e7d4a9c6f3 (rows missing
+``content_html`` or ``excerpt_derived``), or with ``--all`` to recompute every
+post after changing the renderer:
+
+    cd backend
+    python -m app.cli.backfill_content --batch-size 500
+"""
+import argparse
+import sys
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.content import legacy_excerpt
+from app.core.database import get_sessionmaker
+from app.crud.post import derive_content_fields
+from app.models.post import Post
+
+
+def backfill(db: Session, batch_size: int = 500, recompute_all: bool = False) -> int:
+    """Update posts in primary-key order, one transaction per batch."""
+    posts = Post.__table__
+    last_id, updated = None, 0
+    while True:
+        stmt = select(Post.id, Post.content, Post.excerpt).order_by(Post.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Post.id > last_id)
+        if not recompute_all:
+            stmt = stmt.where(or_(Post.content_html.is_(None), Post.excerpt_derived.is_(None)))
+        rows = db.execute(stmt).all()
+        if not rows:
+            return updated
+
+        values = []
+        for post_id, content, excerpt in rows:
+            fields = derive_content_fields(content or "")
+            # Keep excerpts the author wrote; replace the old content[:150] cut
+            if excerpt and excerpt not in (legacy_excerpt(content), fields["excerpt"]):
+                fields["excerpt"] = excerpt
+                fields["excerpt_derived"] = False
+            values.append({"post_id": post_id, **fields})
+        db.execute(
+            update(posts)
+            .where(posts.c.id == bindparam("post_id"))
+            # Rendering isn't an edit, so updated_at stays as it was
+            .values(updated_at=posts.c.updated_at),
+            values,
+        )
+        db.commit()
+
+        updated += len(values)
+        last_id = rows[-1].id
+        print(f"updated {updated} posts", file=sys.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--all", action="store_true", help="recompute posts that already have derived fields")
+    args = parser.parse_args(argv)
+
+    with get_sessionmaker()() as db:
+        updated = backfill(db, args.batch_size, args.all)
+    print(f"backfilled {updated} posts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Stream an NDJSON file of posts to the bulk import endpoint.
+
+Each line is a JSON object accepted by ``POST /api/v1/posts/``. The file is
+sent with chunked transfer encoding, so its size doesn't matter:
+
+    cd backend
+    python -m app.cli.import_posts posts.ndjson --username alice --password ...
+    gunzip -c export.ndjson.gz | python -m app.cli.import_posts - --token ...
+"""
+import argparse
+import http.client
+import json
+import sys
+from typing import BinaryIO, Iterator
+from urllib.parse import urlencode, urlsplit
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _connection(base_url: str) -> http.client.HTTPConnection:
+    parts = urlsplit(base_url)
+    if parts.scheme == "https":
+        return http.client.HTTPSConnection(parts.netloc)
+    return http.client.HTTPConnection(parts.netloc)
+
+
+def _read_json(response: http.client.HTTPResponse) -> dict:
+    body = response.read()
+    if response.status >= 400:
+        raise SystemExit(f"{response.status} {response.reason}: {body.decode(errors='replace')}")
+    return json.loads(body)
+
+
+def login(base_url: str, username: str, password: str) -> str:
+    conn = _connection(base_url)
+    conn.request(
+        "POST",
+        urlsplit(base_url).path.rstrip("/") + "/auth/login",
+        body=urlencode({"username": username, "password": password}),
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return _read_json(conn.getresponse())["access_token"]
+
+
+def _chunks(source: BinaryIO) -> Iterator[bytes]:
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_file(base_url: str, token: str, source: BinaryIO, batch_size: int = None) -> dict:
+    path = urlsplit(base_url).path.rstrip("/") + "/posts/import"
+    if batch_size:
+        path += "?" + urlencode({"batch_size": batch_size})
+    conn = _connection(base_url)
+    conn.request(
+        "POST",
+        path,
+        body=_chunks(source),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"},
+        encode_chunked=True,
+    )
+    return _read_json(conn.getresponse())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", help="NDJSON file to import, or - for stdin")
+    parser.add_argument("--api-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--token", help="Bearer token; otherwise log in with --username/--password")
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--batch-size", type=int, help="Posts per transaction (server default if omitted)")
+    args = parser.parse_args(argv)
+
+    token = args.token
+    if not token:
+        if not (args.username and args.password):
+            parser.error("either --token or --username and --password are required")
+        token = login(args.api_url, args.username, args.password)
+
+    if args.file == "-":
+        result = import_file(args.api_url, token, sys.stdin.buffer, args.batch_size)
+    else:
+        with open(args.file, "rb") as source:
+            result = import_file(args.api_url, token, source, args.batch_size)
+
+    for error in result["errors"]:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    print(f"imported {result['imported']}, failed {result['failed']}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
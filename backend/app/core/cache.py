@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional, Tuple
+from app.core.config import settings
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire after a per-entry TTL.
+
+    Safe to share between the event loop and threadpool workers.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PrincipalCache:
+    """Authenticated users keyed by bearer token, invalidated per user id."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize)
+
+    def get(self, token: str) -> Optional[Any]:
+        entry = self._cache.get(token)
+        return entry[1] if entry is not None else None
+
+    def set(self, token: str, user_id: str, user: Any, expires_in: float) -> None:
+        # Never serve a principal past its token's own expiry
+        self._cache.set(token, (user_id, user), min(self.ttl, expires_in))
+
+    def invalidate_user(self, user_id: str) -> None:
+        # Updates are rare next to reads, so a scan of the bounded cache is fine
+        self._cache.delete_where(lambda _, entry: entry[0] == user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+class ResponseCache:
+    """Serialized public GET responses, dropped wholesale on any content write.
+
+    Each write bumps ``generation``; a response built under an older
+    generation is not stored, so a read racing a write can't cache stale data.
+    Nor is one read from a replica within ``replica_lag`` seconds of a write,
+    since the replica may not have the write yet.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, replica_lag: float = 0):
+        self.ttl = ttl
+        self.replica_lag = replica_lag
+        self.generation = 0
+        self._invalidated_at = float("-inf")
+        self._cache = TTLCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    def set(self, key: str, generation: int, entry: Any, from_replica: bool = False) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            if from_replica and monotonic() - self._invalidated_at < self.replica_lag:
+                return
+            self._cache.set(key, entry, self.ttl)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._invalidated_at = monotonic()
+            self._cache.clear()
+
+
+response_cache = ResponseCache(
+    maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    replica_lag=settings.DATABASE_REPLICA_STICKY_SECONDS,
+)
+
+
+# Cached exact counts for count=estimated listings that have no cheaper source
+count_cache = TTLCache(maxsize=1024)
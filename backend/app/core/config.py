@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Literal
 from pydantic_settings import BaseSettings
 
 
@@ -7,9 +7,103 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "commonminds API"
     DATABASE_URL: str
+    # Serve requests through an AsyncSession (asyncpg / aiosqlite) instead of
+    # running the sync Session in the threadpool
+    DATABASE_ASYNC: bool = False
+    # "queue" pools connections in-process; "null" opens one per checkout for
+    # deployments behind an external pooler such as PgBouncer
+    DATABASE_POOL_MODE: Literal["queue", "null"] = "queue"
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    # Recycle connections before serverless Postgres drops them when idle
+    DATABASE_POOL_RECYCLE: int = 300
+    DATABASE_POOL_PRE_PING: bool = True
+    # Opened at startup (capped at the pool size) so the first requests
+    # don't wait on connection setup; 0 connects on demand
+    DATABASE_WARM_CONNECTIONS: int = 0
+    # Comma separated read replica URLs. Public read routes go round-robin
+    # across the healthy ones; writes, auth and a client's reads for
+    # DATABASE_REPLICA_STICKY_SECONDS after it writes stay on the primary.
+    # That is also the replication lag the response cache allows for
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_STICKY_SECONDS: int = 5
+    # Seconds between replica health checks; a replica that fails one is
+    # skipped for this long
+    DATABASE_REPLICA_HEALTH_INTERVAL: float = 10
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Per-process cache of authenticated users keyed by token; 0 disables.
+    # Other workers only see a user update once their entry expires.
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Per-process cache of public read responses; 0 disables. Writes clear it
+    # locally, the TTL bounds how stale other workers can be.
+    RESPONSE_CACHE_MAX_SIZE: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+    # How long count=estimated may reuse an exact count it had to compute
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    # Bulk import: posts per transaction and the longest accepted NDJSON line
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_LINE_BYTES: int = 1_048_576
+    # Each worker keeps its own related-posts index, updated by its own
+    # writes; rebuilding it this often picks up everyone else's. 0 disables
+    RELATED_POSTS_REFRESH_SECONDS: int = 300
+    # Rows fetched per round trip when streaming an export
+    EXPORT_BATCH_SIZE: int = 500
+    # Most posts one export streams; ask for more with since/until/author
+    EXPORT_MAX_ROWS: int = 100_000
+    # Background jobs (app.core.jobs): worker threads and the in-memory queue
+    # in front of them. Jobs that don't fit stay in the outbox table, which is
+    # polled this often for them, for due retries and for jobs left behind by
+    # other or crashed processes. Workers share the GIL (and on SQLite the
+    # write lock) with requests, so more only help jobs that wait on I/O
+    JOBS_WORKERS: int = 1
+    JOBS_QUEUE_SIZE: int = 1000
+    JOBS_POLL_SECONDS: float = 5
+    # A claimed job still unfinished after this long is run again
+    JOBS_LEASE_SECONDS: int = 300
+    # Attempts before a job is marked failed; retries back off exponentially
+    JOBS_MAX_ATTEMPTS: int = 5
+    JOBS_RETRY_BASE_SECONDS: float = 2
+    JOBS_RETRY_MAX_SECONDS: float = 600
+    # Jobs that start this long after they were due are logged
+    JOBS_SLOW_LAG_MS: int = 5000
+    # Posts' planner statistics and search index are refreshed this long
+    # after the last batch of an import, once per import rather than per batch
+    POST_STATISTICS_DEBOUNCE_SECONDS: float = 10
+    # Serve /metrics (pool, hasher, limiter, job queue and per-route stats).
+    # It is unauthenticated, so only turn it on where the API is internal
+    METRICS_ENABLED: bool = False
+    LOG_LEVEL: str = "INFO"
+    # Requests and SQL statements slower than these are logged
+    SLOW_REQUEST_MS: int = 500
+    SLOW_QUERY_MS: int = 100
+    # Token buckets in front of login/register: sustained requests per
+    # minute and burst size, per client IP and per submitted username, and
+    # in front of exports, per user
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 20
+    AUTH_RATE_LIMIT_IP_BURST: int = 10
+    AUTH_RATE_LIMIT_USERNAME_PER_MINUTE: float = 10
+    AUTH_RATE_LIMIT_USERNAME_BURST: int = 5
+    # Exports scan and serialize whole tables, so each user gets only a few
+    EXPORT_RATE_LIMIT_PER_MINUTE: float = 2
+    EXPORT_RATE_LIMIT_BURST: int = 3
+    # Argon2 runs on this pool; requests beyond workers + queue get a 503
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+    # Start the hasher workers and load Argon2 at startup instead of on the
+    # first login; costs one hash per worker before serving
+    PASSWORD_HASH_PREWARM: bool = False
+    # How Post.author and Post.tags are loaded on read paths ("lazy" is not
+    # usable with DATABASE_ASYNC, serialization can't lazy load)
+    POST_LOADER_STRATEGY: Literal["selectin", "joined", "lazy"] = "selectin"
 
     class Config:
         env_file = None
@@ -1,24 +1,282 @@
-from typing import Generator, Any
-from sqlalchemy import create_engine
+import asyncio
+import threading
+from typing import Generator, AsyncGenerator, Any, Callable, Optional, TypeVar, Union
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings  # Changed from 'core.config' to 'app.core.config'
+from app.core.instrumentation import instrument_engine
+from app.core.pooling import PoolMetrics, engine_options, instrument_pool
+from app.core.replicas import Replica, ReplicaSet, record_write, watch_replica
 
-# Fix for Vercel/Neon using postgres:// instead of postgresql://
-db_url = str(settings.DATABASE_URL)
-if db_url.startswith("postgres://"):
-    db_url = db_url.replace("postgres://", "postgresql://", 1)
+T = TypeVar("T")
 
-# Convert PostgresDsn to string
-engine = create_engine(db_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _normalize_url(url: str) -> str:
+    # Fix for Vercel/Neon using postgres:// instead of postgresql://
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+db_url = _normalize_url(str(settings.DATABASE_URL))
+
+# Engines are built on first use rather than at import: creating one imports
+# the DBAPI driver (psycopg2 alone is ~70ms), which a cold start shouldn't pay
+# before it knows it needs the database. ``engine``, ``SessionLocal`` and the
+# async counterparts stay importable through the module __getattr__ below.
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_replicas: Optional[ReplicaSet] = None
+_engine_lock = threading.Lock()
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+_async_session_factory = async_sessionmaker(autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
+
+# Read replicas only ever see reads, so any commit is a write on the primary;
+# the client's next reads then stay on the primary (see ReadYourWritesMiddleware)
+event.listen(Session, "after_commit", lambda session: record_write())
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        # Sync dependencies run on the threadpool, so first requests can race
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(db_url, **engine_options(db_url, pool_metrics))
+                instrument_pool(engine.pool, pool_metrics)
+                instrument_engine(engine)
+                _session_factory.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    get_engine()
+    return _session_factory
+
+
 # Dependency to get DB session
 def get_db() -> Generator[Session, Any, None]:
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+
+def _async_db_url(url: str) -> str:
+    # Swap the sync DBAPI for its asyncio counterpart
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+        # asyncpg takes "ssl" rather than libpq's "sslmode"
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+        parsed = parsed.set(query=query)
+    elif parsed.drivername in ("sqlite", "sqlite+pysqlite"):
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """The async engine used when DATABASE_ASYNC is enabled. The sync engine
+    stays available for migrations and scripts."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                async_db_url = _async_db_url(db_url)
+                engine = create_async_engine(
+                    async_db_url, **engine_options(async_db_url, async_pool_metrics, is_async=True)
+                )
+                instrument_pool(engine.sync_engine.pool, async_pool_metrics)
+                instrument_engine(engine.sync_engine)
+                _async_session_factory.configure(bind=engine)
+                _async_engine = engine
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    get_async_engine()
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def _build_replica(url: str) -> Replica:
+    url = _normalize_url(url)
+    metrics = PoolMetrics()
+    if settings.DATABASE_ASYNC:
+        async_url = _async_db_url(url)
+        engine = create_async_engine(async_url, **engine_options(async_url, metrics, is_async=True))
+        sync_engine = engine.sync_engine
+        factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    else:
+        engine = sync_engine = create_engine(url, **engine_options(url, metrics))
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    instrument_pool(sync_engine.pool, metrics)
+    instrument_engine(sync_engine)
+    replica = Replica(make_url(url).render_as_string(hide_password=True), engine, factory, metrics)
+    watch_replica(sync_engine, replica)
+    return replica
+
+
+def get_replicas() -> Optional[ReplicaSet]:
+    """Replicas from DATABASE_REPLICA_URLS, built on first use; None if unset."""
+    global _replicas
+    if _replicas is None and settings.DATABASE_REPLICA_URLS.strip():
+        with _engine_lock:
+            if _replicas is None:
+                urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+                _replicas = ReplicaSet([_build_replica(url) for url in urls])
+    return _replicas
+
+
+def _choose_replica() -> Optional[Replica]:
+    replicas = get_replicas()
+    return replicas.choose() if replicas is not None else None
+
+
+def get_read_sessionmaker() -> sessionmaker:
+    """Session factory for read-only work: a healthy replica unless the
+    client has just written, otherwise the primary."""
+    replica = _choose_replica()
+    return replica.sessionmaker if replica is not None else get_sessionmaker()
+
+
+def get_async_read_sessionmaker() -> async_sessionmaker:
+    replica = _choose_replica()
+    return replica.sessionmaker if replica is not None else get_async_sessionmaker()
+
+
+def get_read_db() -> Generator[Session, Any, None]:
+    db = get_read_sessionmaker()()
+    try:
+        yield db
+    finally:
         db.close()
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_read_sessionmaker()() as db:
+        yield db
+
+
+def _ping(engine: Engine) -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def check_replicas() -> None:
+    """Ping every replica once and mark it up or down."""
+    for replica in get_replicas().replicas:
+        try:
+            if settings.DATABASE_ASYNC:
+                async with replica.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            else:
+                await run_in_threadpool(_ping, replica.engine)
+        except (SQLAlchemyError, OSError) as e:
+            replica.mark_down(e)
+        else:
+            replica.mark_up()
+
+
+async def monitor_replicas() -> None:
+    while True:
+        await check_replicas()
+        await asyncio.sleep(settings.DATABASE_REPLICA_HEALTH_INTERVAL)
+
+
+def __getattr__(name: str) -> Any:
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    if name == "async_engine":
+        return get_async_engine() if settings.DATABASE_ASYNC else None
+    if name == "AsyncSessionLocal":
+        return get_async_sessionmaker() if settings.DATABASE_ASYNC else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _warm_count(pool, count: int) -> int:
+    if isinstance(pool, NullPool):
+        # Nothing is kept between checkouts, so there is nothing to warm
+        return 0
+    size = getattr(pool, "size", None)
+    # Connections past pool_size are closed on return, not kept
+    return min(count, size()) if callable(size) else count
+
+
+def warm_connections(count: int) -> int:
+    """Open up to ``count`` pooled connections and return them to the pool."""
+    engine = get_engine()
+    connections = []
+    try:
+        for _ in range(_warm_count(engine.pool, count)):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def warm_async_connections(count: int) -> int:
+    engine = get_async_engine()
+    connections = []
+    try:
+        for _ in range(_warm_count(engine.sync_engine.pool, count)):
+            connections.append(await engine.connect())
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+async def dispose_engines() -> None:
+    if _replicas is not None:
+        for replica in _replicas.replicas:
+            if isinstance(replica.engine, AsyncEngine):
+                await replica.engine.dispose()
+            else:
+                replica.engine.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+DBSession = Union[Session, AsyncSession]
+
+# Dependencies used by the API routes; read-only routes use get_read_session
+get_session = get_async_db if settings.DATABASE_ASYNC else get_db
+get_read_session = get_async_read_db if settings.DATABASE_ASYNC else get_read_db
+
+
+async def run_crud(db: Any, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a sync crud function from a route.
+
+    With a plain Session the function runs in the threadpool. With an
+    AsyncSession it runs through ``run_sync``, which is a greenlet on the
+    event loop thread: only its database I/O yields, so CPU-heavy steps
+    (rendering markdown) belong in ``run_in_threadpool`` before the call,
+    with the results passed in.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
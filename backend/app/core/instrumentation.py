@@ -0,0 +1,166 @@
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the request latency histogram buckets
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+
+def latency_percentiles(samples: Iterable[float]) -> Dict[str, Optional[float]]:
+    """p50, p95 and max, in milliseconds, of latencies given in seconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "max": None}
+    return {
+        "p50": ordered[len(ordered) // 2] * 1000,
+        "p95": ordered[int(len(ordered) * 0.95)] * 1000,
+        "max": ordered[-1] * 1000,
+    }
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+# The stats object is shared by reference, so statements run from the
+# threadpool or an AsyncSession greenlet still land on the right request
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute statement counts and DB time to the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - conn.info["query_start_time"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            # Parameters are left out on purpose, they can hold user data
+            logger.warning(
+                "slow query",
+                extra={"duration_ms": round(elapsed * 1000, 2), "statement": statement[:2000]},
+            )
+
+
+class RouteMetrics:
+    """Per-route request counts, latency histograms and DB totals."""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, status: int, elapsed_ms: float, stats: RequestStats) -> None:
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    "count": 0,
+                    "errors": 0,
+                    "latency_ms_sum": 0.0,
+                    "buckets": [0] * len(LATENCY_BUCKETS_MS),
+                    "queries_sum": 0,
+                    "db_time_ms_sum": 0.0,
+                }
+            entry["count"] += 1
+            entry["errors"] += status >= 500
+            entry["latency_ms_sum"] += elapsed_ms
+            entry["buckets"][bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            entry["queries_sum"] += stats.queries
+            entry["db_time_ms_sum"] += stats.db_time * 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {route: dict(entry, buckets=list(entry["buckets"])) for route, entry in self._routes.items()}
+        for entry in routes.values():
+            # Cumulative, Prometheus style: count of requests at or under each bound
+            cumulative, running = {}, 0
+            for bound, count in zip(LATENCY_BUCKETS_MS, entry.pop("buckets")):
+                running += count
+                cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+            entry["latency_ms_buckets"] = cumulative
+            entry["latency_ms_sum"] = round(entry["latency_ms_sum"], 3)
+            entry["db_time_ms_sum"] = round(entry["db_time_ms_sum"], 3)
+        return routes
+
+
+route_metrics = RouteMetrics()
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return "<unmatched>"
+    # FastAPI includes routers lazily, so the matched route only knows its
+    # path within its router; the effective context has it with the prefixes
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    return getattr(effective, "path", None) or route.path
+
+
+class RequestTimingMiddleware:
+    """Times each request, counts its SQL and reports it via Server-Timing."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'app;dur={elapsed_ms:.1f}, db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            elapsed_ms = (perf_counter() - start) * 1000
+            route_name = f'{scope["method"]} {_route_template(scope)}'
+            route_metrics.observe(route_name, status, elapsed_ms, stats)
+            if elapsed_ms >= settings.SLOW_REQUEST_MS:
+                logger.warning(
+                    "slow request",
+                    extra={
+                        "route": route_name,
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round(elapsed_ms, 2),
+                        "queries": stats.queries,
+                        "db_time_ms": round(stats.db_time * 1000, 2),
+                    },
+                )
@@ -0,0 +1,363 @@
+import logging
+import queue
+import random
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from time import monotonic, perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import delete, event, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_sessionmaker
+from app.core.ids import new_id
+from app.core.instrumentation import latency_percentiles
+from app.models.job import OutboxJob
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+FAILED = "failed"
+
+# Handlers take a session on the primary and the job's payload
+Handler = Callable[[Session, dict], None]
+
+# Jobs enqueued on a session wait under this key until it commits
+_SESSION_KEY = "outbox_jobs"
+
+
+class JobQueue:
+    """Runs side work after a write commits, off the request path.
+
+    A job is a ``job_outbox`` row written by ``enqueue`` in the same
+    transaction as the change that caused it, so a job exists exactly when
+    its change does. After the commit its id goes onto a bounded in-memory
+    queue served by worker threads; a poller picks up whatever that queue had
+    no room for, retries that have come due, and jobs left behind by a
+    stopped or crashed process.
+
+    Jobs run at least once, so handlers must be idempotent. A handler may
+    commit its own work; the job's row is deleted once it returns. One that
+    raises is retried with exponential backoff and, after ``max_attempts``,
+    kept as failed.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        slow_lag_ms: float,
+    ):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.slow_lag_ms = slow_lag_ms
+        self._handlers: Dict[str, Tuple[Handler, int]] = {}
+        # Event name -> (job name, debounce seconds) of each job hooked to it
+        self._hooks: Dict[str, List[Tuple[str, float]]] = {}
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=queue_size)
+        # Ids on the queue or running here, so the poller doesn't queue them twice
+        self._queued: set = set()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._in_flight = 0
+        self._enqueued = 0
+        self._completed = 0
+        self._retried = 0
+        self._failed = 0
+        self._overflowed = 0
+        self._lags: deque[float] = deque(maxlen=1000)
+        self._run_times: deque[float] = deque(maxlen=1000)
+
+    def job(self, name: str, max_attempts: Optional[int] = None) -> Callable[[Handler], Handler]:
+        """Register the decorated function as the handler for jobs named ``name``."""
+        def register(fn: Handler) -> Handler:
+            self._handlers[name] = (fn, max_attempts or self.max_attempts)
+            return fn
+        return register
+
+    def on(
+        self, event_name: str, max_attempts: Optional[int] = None, debounce: float = 0
+    ) -> Callable[[Handler], Handler]:
+        """Run the decorated function as a job after every ``event_name``.
+
+        With ``debounce``, a burst of events runs it once, ``debounce``
+        seconds after the last of them (see ``enqueue``).
+
+        The job is named after the function, and that name is what the
+        outbox stores: renaming a hooked function strands its pending jobs.
+        """
+        def register(fn: Handler) -> Handler:
+            name = f"{fn.__module__}.{fn.__qualname__}"
+            self.job(name, max_attempts)(fn)
+            self._hooks.setdefault(event_name, []).append((name, debounce))
+            return fn
+        return register
+
+    def emit(self, db: Session, event_name: str, payload: dict) -> None:
+        """Enqueue every job hooked to ``event_name``. Call it before the
+        commit of the change the event describes."""
+        for name, debounce in self._hooks.get(event_name, ()):
+            self.enqueue(db, name, payload, debounce=debounce)
+
+    def enqueue(self, db: Session, name: str, payload: dict, delay: float = 0, debounce: float = 0) -> str:
+        """Add a job to ``db``'s transaction; it is queued once that commits.
+
+        With ``debounce``, a pending ``name`` job that hasn't started yet is
+        pushed back to run ``debounce`` seconds from now, keeping its
+        payload, instead of a second one being added.
+        """
+        now = datetime.utcnow()
+        if debounce:
+            delay = debounce
+            job_id = db.execute(
+                update(OutboxJob)
+                .where(OutboxJob.name == name, OutboxJob.status == PENDING, OutboxJob.locked_until.is_(None))
+                .values(run_at=now + timedelta(seconds=delay))
+                .returning(OutboxJob.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().first()
+            if job_id is not None:
+                return job_id
+        job_id = new_id()
+        db.add(OutboxJob(
+            id=job_id, name=name, payload=payload, created_at=now, run_at=now + timedelta(seconds=delay),
+        ))
+        db.info.setdefault(_SESSION_KEY, []).append((job_id, not delay))
+        return job_id
+
+    def _committed(self, jobs: List[Tuple[str, bool]]) -> None:
+        if not self._threads and not self._stopping.is_set():
+            # Workers start on first use (or from resume())
+            self.start()
+        with self._lock:
+            self._enqueued += len(jobs)
+        for job_id, due in jobs:
+            # Delayed jobs are left to the poller
+            if due:
+                self._submit(job_id)
+
+    def _submit(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id in self._queued or self._stopping.is_set():
+                return False
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                # Still pending in the outbox; the poller queues it later
+                self._overflowed += 1
+                return False
+            self._queued.add(job_id)
+            return True
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before retrying a job that has failed ``attempts`` times."""
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempts - 1))
+        # Jittered, so jobs that failed together (a database blip) spread out
+        return random.uniform(delay / 2, delay)
+
+    def _claim(self, db: Session, job_id: str) -> Optional[tuple]:
+        now = datetime.utcnow()
+        row = db.execute(
+            update(OutboxJob)
+            .where(
+                OutboxJob.id == job_id,
+                OutboxJob.status == PENDING,
+                OutboxJob.run_at <= now,
+                or_(OutboxJob.locked_until.is_(None), OutboxJob.locked_until <= now),
+            )
+            .values(attempts=OutboxJob.attempts + 1, locked_until=now + timedelta(seconds=self.lease_seconds))
+            .returning(OutboxJob.name, OutboxJob.payload, OutboxJob.attempts, OutboxJob.run_at)
+        ).first()
+        # Commit the lease so other processes see it while the job runs
+        db.commit()
+        return (*row, now) if row is not None else None
+
+    def _run(self, job_id: str) -> None:
+        with get_sessionmaker()() as db:
+            claimed = self._claim(db, job_id)
+            if claimed is None:
+                # Already done, claimed by another process, or not due yet
+                return
+            name, payload, attempts, run_at, started_at = claimed
+            lag = max(0.0, (started_at - run_at).total_seconds())
+            self._lags.append(lag)
+            if lag * 1000 >= self.slow_lag_ms:
+                logger.warning("slow background job start", extra={"job": name, "lag_ms": round(lag * 1000, 1)})
+
+            handler, max_attempts = self._handlers.get(name, (None, self.max_attempts))
+            start = perf_counter()
+            try:
+                if handler is None:
+                    raise LookupError(f"no handler registered for job {name!r}")
+                handler(db, payload)
+                db.execute(delete(OutboxJob).where(OutboxJob.id == job_id))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._record_failure(db, job_id, name, attempts, max_attempts, e)
+            else:
+                with self._lock:
+                    self._completed += 1
+            finally:
+                self._run_times.append(perf_counter() - start)
+
+    def _record_failure(
+        self, db: Session, job_id: str, name: str, attempts: int, max_attempts: int, error: Exception
+    ) -> None:
+        values = {"locked_until": None, "last_error": f"{type(error).__name__}: {error}"[:2000]}
+        if attempts >= max_attempts:
+            values["status"] = FAILED
+            logger.error(
+                "background job failed", exc_info=error, extra={"job": name, "job_id": job_id, "attempts": attempts}
+            )
+            with self._lock:
+                self._failed += 1
+        else:
+            delay = self.backoff(attempts)
+            values["run_at"] = datetime.utcnow() + timedelta(seconds=delay)
+            logger.warning(
+                "background job retry scheduled",
+                extra={"job": name, "job_id": job_id, "attempts": attempts, "retry_in_s": round(delay, 1), "error": str(error)},
+            )
+            with self._lock:
+                self._retried += 1
+        db.execute(update(OutboxJob).where(OutboxJob.id == job_id).values(**values))
+        db.commit()
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job_id = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            with self._lock:
+                self._in_flight += 1
+            try:
+                self._run(job_id)
+            except Exception:
+                # e.g. the database is down; the lease runs out and the job
+                # is picked up again by a later poll
+                logger.exception("background job runner error", extra={"job_id": job_id})
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._queued.discard(job_id)
+
+    def poll(self) -> int:
+        """Queue due outbox jobs that aren't queued here yet; returns how many."""
+        room = self._queue.maxsize - self._queue.qsize()
+        if room <= 0:
+            return 0
+        now = datetime.utcnow()
+        with get_sessionmaker()() as db:
+            job_ids = db.execute(
+                select(OutboxJob.id)
+                .where(
+                    OutboxJob.status == PENDING,
+                    OutboxJob.run_at <= now,
+                    or_(OutboxJob.locked_until.is_(None), OutboxJob.locked_until <= now),
+                )
+                .order_by(OutboxJob.run_at)
+                .limit(room + len(self._queued))
+            ).scalars().all()
+        return sum(self._submit(job_id) for job_id in job_ids)
+
+    def _poll_forever(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                # e.g. migrations not applied yet; try again next round
+                logger.warning("job outbox poll failed", extra={"error": str(e)})
+            if self._stopping.wait(self.poll_seconds):
+                return
+
+    def start(self) -> None:
+        """Start the workers and the outbox poller."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            self._threads.append(threading.Thread(target=self._poll_forever, name="job-poller", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def resume(self) -> bool:
+        """Start the workers if the outbox holds pending jobs, e.g. ones left
+        by a previous run; returns whether it does."""
+        with get_sessionmaker()() as db:
+            pending = db.execute(select(OutboxJob.id).where(OutboxJob.status == PENDING).limit(1)).first()
+        if pending is not None:
+            self.start()
+        return pending is not None
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """Stop taking jobs and wait up to ``timeout`` for running ones.
+        Queued jobs stay pending in the outbox for the next start."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._stopping.set()
+            while True:
+                try:
+                    self._queued.discard(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+        deadline = monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - monotonic()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": bool(self._threads),
+                "in_flight": self._in_flight,
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "enqueued": self._enqueued,
+                "completed": self._completed,
+                "retried": self._retried,
+                "failed": self._failed,
+                "overflowed": self._overflowed,
+                # From when a job was due to when a worker started it
+                "lag_ms": latency_percentiles(self._lags),
+                "run_ms": latency_percentiles(self._run_times),
+            }
+
+
+job_queue = JobQueue(
+    workers=settings.JOBS_WORKERS,
+    queue_size=settings.JOBS_QUEUE_SIZE,
+    poll_seconds=settings.JOBS_POLL_SECONDS,
+    lease_seconds=settings.JOBS_LEASE_SECONDS,
+    max_attempts=settings.JOBS_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOBS_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.JOBS_RETRY_MAX_SECONDS,
+    slow_lag_ms=settings.JOBS_SLOW_LAG_MS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_committed_jobs(session: Session) -> None:
+    jobs = session.info.pop(_SESSION_KEY, None)
+    if jobs:
+        job_queue._committed(jobs)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back_jobs(session: Session, previous_transaction) -> None:
+    session.info.pop(_SESSION_KEY, None)
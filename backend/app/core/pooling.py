@@ -0,0 +1,115 @@
+import threading
+from collections import deque
+from time import perf_counter
+from typing import Any, Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+from app.core.config import settings
+from app.core.instrumentation import latency_percentiles
+
+
+class PoolMetrics:
+    """Counters and checkout wait times for one engine's connection pool."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.overflow_connects = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self._waits: deque[float] = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+
+    def stats(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._waits)
+        stats: Dict[str, Any] = {
+            "pool": type(pool).__name__,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "overflow_connects": self.overflow_connects,
+            "timeouts": self.timeouts,
+            "invalidations": self.invalidations,
+            "wait_ms": latency_percentiles(waits),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(0, pool.overflow()),
+            )
+        return stats
+
+
+class _TimedCheckoutMixin:
+    # SQLAlchemy has no event for the time spent waiting on a queue pool, so
+    # the queue pools are subclassed around _do_get / _inc_overflow instead.
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(perf_counter() - start)
+
+    def _inc_overflow(self):
+        created = super()._inc_overflow()
+        if created and self._overflow > 0:
+            self.metrics.overflow_connects += 1
+        return created
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine from Settings."""
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DATABASE_POOL_PRE_PING}
+
+    if settings.DATABASE_POOL_MODE == "null":
+        # An external pooler (PgBouncer, Neon's pooled endpoint) owns pooling
+        options["poolclass"] = NullPool
+        return options
+
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite picks its own pool per database type; sizing doesn't apply
+        return options
+
+    base = TimedAsyncQueuePool if is_async else TimedQueuePool
+    options.update(
+        poolclass=type(base.__name__, (base,), {"metrics": metrics}),
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    )
+    return options
+
+
+def instrument_pool(pool: Pool, metrics: PoolMetrics) -> None:
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
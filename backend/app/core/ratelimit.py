@@ -0,0 +1,88 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+from typing import Tuple
+from app.core.config import settings
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller has used up its bucket; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """Token-bucket storage. Implement this to share buckets across workers."""
+
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        """Take one token from ``key``'s bucket.
+
+        ``rate`` is tokens refilled per second and ``capacity`` the bucket
+        size. Returns 0 when a token was taken, otherwise the seconds until
+        one will be available.
+        """
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets in an LRU map capped at ``max_keys``.
+
+    Lookup, refill and eviction are all O(1); the least recently seen key
+    is dropped first, which at worst hands that caller a fresh bucket.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> float:
+        now = monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self._evictions += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "max_keys": self.max_keys, "evictions": self._evictions}
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._rejected = 0
+
+    async def hit(self, key: str, per_minute: float, burst: int) -> None:
+        """Count one request against ``key``, raising RateLimitExceeded when over."""
+        if not self.enabled:
+            return
+        wait = await self.backend.acquire(key, per_minute / 60, burst)
+        if wait > 0:
+            self._rejected += 1
+            raise RateLimitExceeded(wait)
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, "rejected": self._rejected, **self.backend.stats()}
+
+
+rate_limiter = RateLimiter(
+    InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS),
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
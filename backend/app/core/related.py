@@ -0,0 +1,211 @@
+import heapq
+import math
+import threading
+from array import array
+from datetime import datetime, timezone
+from time import monotonic, time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Score = sum over shared tags of log(1 + posts / posts with that tag), plus
+# a recency bonus of up to RECENCY_WEIGHT that halves every half-life; the
+# bonus mostly orders candidates with similar overlap
+RECENCY_WEIGHT = 0.5
+RECENCY_HALF_LIFE_DAYS = 30.0
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        # Naive values are stored as UTC (see create_post)
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class _Tables:
+    """The index itself. Posts and tags are interned to dense ints so the
+    postings are flat arrays of slots rather than sets of strings."""
+
+    def __init__(self):
+        self.post_ids: List[Optional[str]] = []
+        self.slots: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.published = array("d")
+        self.post_tags: List[Tuple[int, ...]] = []
+        self.tag_ids: Dict[str, int] = {}
+        self.postings: List[array] = []
+
+    def _tag(self, name: str) -> int:
+        tag = self.tag_ids.get(name)
+        if tag is None:
+            tag = self.tag_ids[name] = len(self.postings)
+            self.postings.append(array("I"))
+        return tag
+
+    def set_tags(self, slot: int, names: Iterable[str]) -> None:
+        new = tuple(dict.fromkeys(self._tag(name) for name in names))
+        old = self.post_tags[slot]
+        for tag in set(old) - set(new):
+            self.postings[tag].remove(slot)
+        for tag in set(new) - set(old):
+            self.postings[tag].append(slot)
+        self.post_tags[slot] = new
+
+    def add(self, post_id: str, published_at: float, names: Iterable[str]) -> None:
+        slot = self.slots.get(post_id)
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+                self.post_ids[slot] = post_id
+                self.published[slot] = published_at
+            else:
+                slot = len(self.post_ids)
+                self.post_ids.append(post_id)
+                self.published.append(published_at)
+                self.post_tags.append(())
+            self.slots[post_id] = slot
+        self.set_tags(slot, names)
+
+    def retag(self, post_id: str, names: Iterable[str]) -> None:
+        slot = self.slots.get(post_id)
+        if slot is not None:
+            self.set_tags(slot, names)
+
+    def remove(self, post_id: str) -> None:
+        slot = self.slots.pop(post_id, None)
+        if slot is not None:
+            self.set_tags(slot, ())
+            self.post_ids[slot] = None
+            self.free.append(slot)
+
+
+class RelatedPostsIndex:
+    """In-memory tag index answering "posts sharing the most tags with this one".
+
+    Loaded from the database by ``rebuild`` and kept current by the post
+    crud functions; writes that land while a rebuild is reading are replayed
+    onto the new tables before they replace the old ones.
+    """
+
+    def __init__(self):
+        self._tables = _Tables()
+        self._lock = threading.Lock()
+        self._pending: Optional[List[tuple]] = None
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self.build_ms: Optional[float] = None
+
+    def _apply(self, op: str, *args) -> None:
+        with self._lock:
+            getattr(self._tables, op)(*args)
+            if self._pending is not None:
+                self._pending.append((op, args))
+
+    def add(self, post_id: str, published_at: Optional[datetime], tags: Iterable[str]) -> None:
+        self._apply("add", post_id, _timestamp(published_at), tuple(tags))
+
+    def set_tags(self, post_id: str, tags: Iterable[str]) -> None:
+        self._apply("retag", post_id, tuple(tags))
+
+    def remove(self, post_id: str) -> None:
+        self._apply("remove", post_id)
+
+    def rebuild(self, load: Callable[[], Tuple[Iterable[tuple], Iterable[tuple]]]) -> None:
+        """Replace the index with what ``load`` returns: posts as
+        (id, published_at) and their tags as (post id, tag name) rows.
+
+        Writes are recorded from before ``load`` runs, so any commit it
+        doesn't see is replayed onto the new tables.
+        """
+        start = monotonic()
+        with self._lock:
+            self._pending = []
+        try:
+            posts, links = load()
+            tags: Dict[str, List[str]] = {}
+            for post_id, tag_name in links:
+                tags.setdefault(post_id, []).append(tag_name)
+            tables = _Tables()
+            for post_id, published_at in posts:
+                tables.add(post_id, _timestamp(published_at), tags.get(post_id, ()))
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for op, args in self._pending:
+                getattr(tables, op)(*args)
+            self._pending = None
+            self._tables = tables
+            self.ready = True
+            self.built_at = time()
+            self.build_ms = (monotonic() - start) * 1000
+
+    def related(self, post_id: str, limit: int) -> Optional[List[str]]:
+        """Ids of up to ``limit`` related posts, best first; None if the post
+        isn't indexed."""
+        with self._lock:
+            tables = self._tables
+            slot = tables.slots.get(post_id)
+            if slot is None:
+                return None
+            total = len(tables.slots)
+            # Rarest tags first: sharing a rare tag says more than sharing a
+            # popular one, and popular tags have the longest postings
+            tags = sorted(tables.post_tags[slot], key=lambda tag: len(tables.postings[tag]))
+            weights = [math.log(1 + total / len(tables.postings[tag])) for tag in tags]
+            scores: Dict[int, float] = {}
+            get = scores.get
+            for i, tag in enumerate(tags):
+                # Once a post sharing none of the tags so far couldn't reach
+                # the top ``limit`` even with all remaining tags, stop
+                # scanning postings and just score the candidates we have
+                # (MaxScore pruning)
+                if len(scores) > limit:
+                    best = heapq.nlargest(limit + 1, scores.values())[-1]
+                    if best >= sum(weights[i:]) + RECENCY_WEIGHT:
+                        remaining = list(zip(tags[i:], weights[i:]))
+                        post_tags = tables.post_tags
+                        for other in scores:
+                            for rest, weight in remaining:
+                                if rest in post_tags[other]:
+                                    scores[other] += weight
+                        break
+                weight = weights[i]
+                for other in tables.postings[tag]:
+                    scores[other] = get(other, 0.0) + weight
+            scores.pop(slot, None)
+            if not scores:
+                return []
+
+            # The recency bonus is bounded, so anything that trails the
+            # limit-th best overlap by more than that can't make the cut
+            if len(scores) > limit:
+                floor = heapq.nlargest(limit, scores.values())[-1] - RECENCY_WEIGHT
+                candidates = [(other, score) for other, score in scores.items() if score >= floor]
+            else:
+                candidates = list(scores.items())
+            now = time()
+            published = tables.published
+            decay = math.log(2) / (RECENCY_HALF_LIFE_DAYS * 86400)
+            ranked = heapq.nlargest(
+                limit,
+                candidates,
+                key=lambda item: item[1] + RECENCY_WEIGHT * math.exp(-decay * max(0.0, now - published[item[0]])),
+            )
+            return [tables.post_ids[other] for other, _ in ranked]
+
+    def stats(self) -> dict:
+        with self._lock:
+            tables = self._tables
+            return {
+                "ready": self.ready,
+                "posts": len(tables.slots),
+                "tags": len(tables.tag_ids),
+                "links": sum(len(posting) for posting in tables.postings),
+                "build_ms": round(self.build_ms, 1) if self.build_ms is not None else None,
+                "age_seconds": round(time() - self.built_at) if self.built_at is not None else None,
+            }
+
+
+related_index = RelatedPostsIndex()
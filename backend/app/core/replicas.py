@@ -0,0 +1,175 @@
+import itertools
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.pooling import PoolMetrics
+
+logger = logging.getLogger(__name__)
+
+# A response to a write tells the client for how many seconds to send the
+# request header; while it does, its reads skip the replicas. Headers rather
+# than a cookie, since the frontend is on another site
+READ_PRIMARY_HEADER = "X-Read-Primary"
+READ_PRIMARY_FOR_HEADER = "X-Read-Primary-For"
+
+
+@dataclass
+class RoutingState:
+    read_primary: bool = False
+    wrote: bool = False
+    read_replica: bool = False
+
+
+# Mutable per-request state, like RequestStats: the threadpool and the async
+# session's greenlet see a copy of the context, but the same object
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar("db_routing_state", default=None)
+
+
+def reads_pinned_to_primary() -> bool:
+    """True when the current client wrote recently and must read its writes."""
+    state = _routing_state.get()
+    return state is not None and state.read_primary
+
+
+def reading_from_replica() -> bool:
+    """True when the current request's reads were routed to a replica."""
+    state = _routing_state.get()
+    return state is not None and state.read_replica
+
+
+def record_write() -> None:
+    # Called after a commit on the primary
+    state = _routing_state.get()
+    if state is not None:
+        state.wrote = True
+
+
+class Replica:
+    def __init__(self, name: str, engine: Any, sessionmaker: Any, pool_metrics: PoolMetrics):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = sessionmaker
+        self.pool_metrics = pool_metrics
+        self.healthy = True
+        self.retry_at = 0.0
+        self.routed = 0
+        self.marked_down = 0
+
+    def available(self, now: float) -> bool:
+        # A down replica gets another request once its retry time has passed
+        return self.healthy or now >= self.retry_at
+
+    def mark_down(self, error: BaseException) -> None:
+        if self.healthy:
+            self.marked_down += 1
+            logger.warning("replica marked down", extra={"replica": self.name, "error": str(error)})
+        self.healthy = False
+        self.retry_at = monotonic() + settings.DATABASE_REPLICA_HEALTH_INTERVAL
+
+    def mark_up(self) -> None:
+        if not self.healthy:
+            logger.info("replica back up", extra={"replica": self.name})
+        self.healthy = True
+
+
+def watch_replica(engine: Engine, replica: Replica) -> None:
+    """Mark ``replica`` down when connecting fails or a connection turns out
+    dead, and back up when a new connection succeeds."""
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        # No connection means the failure happened while connecting
+        if context.is_disconnect or context.connection is None:
+            replica.mark_down(context.original_exception)
+
+    @event.listens_for(engine.pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        replica.mark_up()
+
+
+class ReplicaSet:
+    """Round-robin over the replicas that are up.
+
+    Replicas are marked down by failed connections (see ``watch_replica``)
+    and by the periodic health check, and come back on the next success.
+    """
+
+    def __init__(self, replicas: List[Replica]):
+        self.replicas = replicas
+        self._next = itertools.count()
+        self.primary_reads = 0
+        self.pinned_reads = 0
+
+    def choose(self) -> Optional[Replica]:
+        """The next available replica, or None to read from the primary."""
+        if reads_pinned_to_primary():
+            self.pinned_reads += 1
+            return None
+        now = monotonic()
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._next) % len(self.replicas)]
+            if replica.available(now):
+                replica.routed += 1
+                state = _routing_state.get()
+                if state is not None:
+                    state.read_replica = True
+                return replica
+        self.primary_reads += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "routed": replica.routed,
+                    "marked_down": replica.marked_down,
+                    "pool": replica.pool_metrics.stats(getattr(replica.engine, "sync_engine", replica.engine).pool),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary for a while after it writes.
+
+    A response to a request that committed on the primary carries
+    ``X-Read-Primary-For: <seconds>``; while the client sends
+    ``X-Read-Primary`` on its requests, read-only routes skip the replicas,
+    so it never reads data older than its own write through replication lag.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = RoutingState(read_primary=READ_PRIMARY_HEADER in Headers(scope=scope))
+        token = _routing_state.set(state)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.wrote:
+                MutableHeaders(scope=message).append(
+                    READ_PRIMARY_FOR_HEADER, str(settings.DATABASE_REPLICA_STICKY_SECONDS)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _routing_state.reset(token)
+
@@ -1,12 +1,30 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from time import perf_counter
 from typing import Optional
-from jose import jwt
-from passlib.context import CryptContext
 from app.core.config import settings  # Changed from 'core.config' to 'app.core.config'
+from app.core.instrumentation import latency_percentiles
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# passlib and jose (via cryptography) add ~120ms to import; only auth routes
+# need them, so they load on first use instead of at startup
+
+@lru_cache(maxsize=None)
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
+
+def __getattr__(name):
+    if name == "pwd_context":
+        return _pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
@@ -14,7 +32,96 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password, hashed_password):
+    # Returns (valid, new_hash); new_hash is set when the stored hash was made
+    # with parameters the context now considers deprecated
+    return _pwd_context().verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool has no room for more work."""
+
+
+class PasswordHasher:
+    """Runs Argon2 off the event loop on a bounded worker pool.
+
+    At most ``workers + max_queue`` operations may be in flight; further
+    calls fail fast with PasswordHasherBusy instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_queue: int, executor: str = "thread"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor_type = executor
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._rejected = 0
+        self._latencies: deque[float] = deque(maxlen=1000)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self._in_flight >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise PasswordHasherBusy()
+
+        self._in_flight += 1
+        start = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._in_flight -= 1
+            self._latencies.append(perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str):
+        return await self._run(verify_and_update_password, plain_password, hashed_password)
+
+    async def warm_up(self) -> None:
+        """Start every worker and load the Argon2 backend in it, so the first
+        login or registration doesn't pay for either."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, get_password_hash, "warm-up")
+            for _ in range(self.workers)
+        ))
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.workers),
+            "max_queue": self.max_queue,
+            "rejected": self._rejected,
+            "latency_ms": latency_percentiles(self._latencies),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
@@ -1,82 +1,542 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.post import Post, Tag
-from app.schemas.post import PostCreate, PostUpdate
+import base64
+import binascii
+import logging
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session, Query, defer, selectinload, joinedload
+from sqlalchemy import Select, delete, func, insert, literal, literal_column, or_, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.core.cache import count_cache, response_cache
+from app.core.config import settings
+from app.core.content import legacy_excerpt, make_excerpt, render_content
+from app.core.ids import new_id
+from app.core.jobs import job_queue
+from app.core.related import related_index
+from app.models.post import Post, Tag, post_tag, posts_fts
+from app.models.user import User
+from app.schemas.post import PostBulkUpdate, PostCreate, PostUpdate, PostSearchResult
 from datetime import datetime
 
-def get_post(db: Session, post_id: str):
-    return db.query(Post).filter(Post.id == post_id).first()
+logger = logging.getLogger(__name__)
+
+# Emitted by import_posts in each batch's transaction with the batch's ids as
+# {"post_ids": [...]}. Functions hooked to it with job_queue.on() run in the
+# background once that transaction commits.
+POST_IMPORTED = "post.imported"
+
+def _loader_options(strategy: Optional[str] = None) -> list:
+    # Serializing a Post touches author and tags, so load them up front
+    # instead of issuing two lazy SELECTs per row.
+    strategy = strategy or settings.POST_LOADER_STRATEGY
+    if strategy == "selectin":
+        return [selectinload(Post.author), selectinload(Post.tags)]
+    if strategy == "joined":
+        return [joinedload(Post.author), joinedload(Post.tags)]
+    return []
+
+def _post_query(db: Session, summary: bool = False) -> Query:
+    query = db.query(Post).options(*_loader_options())
+    if summary:
+        # Leave the (potentially very large) body out of the SELECT entirely
+        query = query.options(
+            defer(Post.content, raiseload=True), defer(Post.content_html, raiseload=True)
+        )
+    return query
+
+def encode_cursor(post: Post) -> str:
+    raw = f"{post.published_at.isoformat()}|{post.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, post_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(published_at), post_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+SORT_ORDERS = {"-published_at": True, "published_at": False}
+
+def _paginate(
+    query: Query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    sort: Optional[str] = None,
+    count: str = "exact",
+    estimate: Optional[Callable[[], Optional[Tuple[int, bool]]]] = None,
+):
+    # The look-ahead row below only tells "more" from "done" for a real page
+    if limit < 1:
+        raise ValueError("Invalid limit")
+    if sort is None:
+        sort = "-published_at"
+    if sort not in SORT_ORDERS:
+        raise ValueError("Invalid sort")
+    descending = SORT_ORDERS[sort]
+
+    if descending:
+        query = query.order_by(Post.published_at.desc(), Post.id.desc())
+    else:
+        query = query.order_by(Post.published_at.asc(), Post.id.asc())
+
+    if cursor is not None:
+        # Keyset mode: seek past the (published_at, id) of the last item seen
+        # instead of counting and offsetting, so every page costs the same.
+        if cursor:
+            key = tuple_(Post.published_at, Post.id)
+            position = decode_cursor(cursor)
+            query = query.filter(key < position if descending else key > position)
+        posts = query.limit(limit + 1).all()
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        return {
+            "items": posts,
+            "total": None,
+            "page": None,
+            "size": limit,
+            "pages": None,
+            "next_cursor": encode_cursor(posts[-1]) if has_more else None,
+        }
+
+    posts = query.offset(skip).limit(limit + 1).all()
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+
+    total, total_exact = None, None
+    if count == "estimated" and estimate is not None:
+        estimated = estimate()
+        if estimated is not None:
+            total, total_exact = estimated
+    if count != "none" and total is None:
+        total = query.order_by(None).with_entities(func.count(Post.id)).scalar()
+        total_exact = True
+    if total is not None and not total_exact:
+        # An estimate must never contradict the page we are returning
+        total = max(total, skip + len(posts) + (1 if has_more else 0))
 
-def get_posts(db: Session, skip: int = 0, limit: int = 100):
-    total = db.query(func.count(Post.id)).scalar()
-    posts = db.query(Post).order_by(Post.published_at.desc()).offset(skip).limit(limit).all()
     return {
         "items": posts,
         "total": total,
+        "total_exact": total_exact,
         "page": skip // limit + 1,
         "size": limit,
-        "pages": (total + limit - 1) // limit
+        "pages": (total + limit - 1) // limit if total is not None else None,
+        "next_cursor": encode_cursor(posts[-1]) if has_more else None,
     }
 
-def get_posts_by_user(db: Session, user_id: str, skip: int = 0, limit: int = 100):
-    total = db.query(func.count(Post.id)).filter(Post.author_id == user_id).scalar()
-    posts = db.query(Post).filter(Post.author_id == user_id).order_by(Post.published_at.desc()).offset(skip).limit(limit).all()
+def _cached_count(key, query: Query) -> Tuple[int, bool]:
+    total = count_cache.get(key)
+    if total is None:
+        total = query.with_entities(func.count(Post.id)).scalar()
+        count_cache.set(key, total, settings.COUNT_CACHE_TTL_SECONDS)
+    return total, False
+
+def _estimate_post_count(db: Session) -> Tuple[int, bool]:
+    if db.get_bind().dialect.name == "postgresql":
+        # Planner statistics, refreshed by autovacuum/ANALYZE; -1 if never analyzed
+        reltuples = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'posts'::regclass")
+        ).scalar()
+        if reltuples is not None and reltuples >= 0:
+            return reltuples, False
+    return _cached_count("posts", db.query(Post))
+
+def _filter_tags(query: Query, tags: Optional[List[str]], match_all: bool = False) -> Query:
+    # Resolved against the (tag_name, post_id) index on post_tags
+    if not tags:
+        return query
+    tags = list(set(tags))
+    post_ids = select(post_tag.c.post_id).where(post_tag.c.tag_name.in_(tags))
+    if match_all and len(tags) > 1:
+        post_ids = post_ids.group_by(post_tag.c.post_id).having(
+            func.count(post_tag.c.tag_name) == len(tags)
+        )
+    return query.filter(Post.id.in_(post_ids))
+
+def get_post(db: Session, post_id: str):
+    return _post_query(db).filter(Post.id == post_id).first()
+
+def get_posts(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    match_all: bool = False,
+    summary: bool = False,
+    count: str = "exact",
+):
+    query = _filter_tags(_post_query(db, summary), tags, match_all)
+
+    def estimate():
+        if not tags:
+            return _estimate_post_count(db)
+        tag_names = sorted(set(tags))
+        if len(tag_names) == 1:
+            # Maintained per tag on write, so exact as well as cheap
+            return db.query(Tag.post_count).filter(Tag.name == tag_names[0]).scalar() or 0, True
+        return _cached_count(("tags", tuple(tag_names), match_all), _filter_tags(db.query(Post), tag_names, match_all))
+
+    return _paginate(query, skip, limit, cursor, sort, count, estimate)
+
+def get_posts_by_user(
+    db: Session,
+    user_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    count: str = "exact",
+):
+    def estimate():
+        # Maintained per author on write, so exact as well as cheap
+        post_count = db.query(User.post_count).filter(User.id == user_id).scalar()
+        return (post_count, True) if post_count is not None else None
+
+    query = _post_query(db, summary).filter(Post.author_id == user_id)
+    return _paginate(query, skip, limit, cursor, count=count, estimate=estimate)
+
+def get_tags(db: Session, limit: int = 100):
+    # post_count is maintained on write, so this never aggregates post_tags
+    return (
+        db.query(Tag)
+        .filter(Tag.post_count > 0)
+        .order_by(Tag.post_count.desc(), Tag.name)
+        .limit(limit)
+        .all()
+    )
+
+def load_related_index(db: Session) -> None:
+    """(Re)build the in-memory related-posts index from the database."""
+    related_index.rebuild(lambda: (
+        db.execute(select(Post.id, Post.published_at)).all(),
+        db.execute(select(post_tag.c.post_id, post_tag.c.tag_name)).all(),
+    ))
+
+def get_related_posts(db: Session, post_id: str, limit: int = 5) -> Optional[List[Post]]:
+    """Posts ranked by shared tags and recency; None if there's no such post."""
+    post_ids = related_index.related(post_id, limit)
+    if post_ids is None:
+        # Not indexed: no such post, or another worker wrote it since the
+        # index was last rebuilt
+        exists = db.scalar(select(Post.id).where(Post.id == post_id))
+        return [] if exists is not None else None
+    if not post_ids:
+        return []
+    posts = {post.id: post for post in _post_query(db, summary=True).filter(Post.id.in_(post_ids))}
+    return [posts[related_id] for related_id in post_ids if related_id in posts]
+
+def _search_query(db: Session, q: str):
+    # Returns (query filtered to matches, relevance expression)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        ts_query = func.websearch_to_tsquery("english", q)
+        search_vector = literal_column("posts.search_vector")
+        score = func.ts_rank_cd(search_vector, ts_query)
+        return _post_query(db).filter(search_vector.op("@@")(ts_query)), score
+    if dialect == "sqlite":
+        # Quote every term so user input can't trip FTS5 query syntax
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+        # bm25() is lower-is-better; weight title over excerpt over content
+        score = -func.bm25(literal_column("posts_fts"), 10.0, 5.0, 1.0)
+        query = (
+            _post_query(db)
+            .join(posts_fts, posts_fts.c.rowid == literal_column("posts.rowid"))
+            .filter(literal_column("posts_fts").op("MATCH")(match))
+        )
+        return query, score
+    pattern = f"%{q}%"
+    query = _post_query(db).filter(
+        or_(Post.title.ilike(pattern), Post.excerpt.ilike(pattern), Post.content.ilike(pattern))
+    )
+    return query, literal(0.0)
+
+def search_posts(db: Session, q: str, skip: int = 0, limit: int = 10):
+    if not q.split():
+        return {"items": [], "total": 0, "page": 1, "size": limit, "pages": 0}
+    
+    query, score = _search_query(db, q)
+    total = query.with_entities(func.count(Post.id)).scalar()
+    rows = (
+        query.add_columns(score.label("score"))
+        .order_by(score.desc(), Post.published_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
     return {
-        "items": posts,
+        "items": [
+            PostSearchResult.model_validate(post).model_copy(update={"score": score})
+            for post, score in rows
+        ],
         "total": total,
         "page": skip // limit + 1,
         "size": limit,
-        "pages": (total + limit - 1) // limit
+        "pages": (total + limit - 1) // limit,
     }
 
-def create_post(db: Session, post: PostCreate, user_id: str):
-    # Process tags
-    tag_objects = []
-    if post.tags:
-        for tag_name in post.tags:
-            tag = db.query(Tag).filter(Tag.name == tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.add(tag)
-            tag_objects.append(tag)
-    
+def export_posts_statement(
+    author_id: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    match_all: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Select:
+    """The first ``EXPORT_MAX_ROWS`` matching posts in (published_at, id)
+    order, fetched in batches.
+
+    ``yield_per`` streams rows through a server-side cursor where the driver
+    has one; selectin loaders run once per batch (joined eager loading of a
+    collection can't be combined with ``yield_per``).
+    """
+    stmt = (
+        select(Post)
+        .options(selectinload(Post.author), selectinload(Post.tags))
+        .order_by(Post.published_at, Post.id)
+    )
+    if author_id:
+        stmt = stmt.where(Post.author_id == author_id)
+    if since:
+        stmt = stmt.where(Post.published_at >= since)
+    if until:
+        stmt = stmt.where(Post.published_at < until)
+    stmt = _filter_tags(stmt, tags, match_all).limit(settings.EXPORT_MAX_ROWS)
+    return stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+
+def release_posts(db: Session, posts: List[Post]):
+    # Drop a streamed batch (and what its loaders pulled in) from the
+    # identity map so memory stays flat; expunge_all() would invalidate the
+    # identity map the still-open result is filling
+    objects = set()
+    for post in posts:
+        objects.add(post)
+        objects.add(post.author)
+        objects.update(post.tags)
+    for obj in objects:
+        if obj is not None and obj in db:
+            db.expunge(obj)
+
+def export_posts(db: Session, **filters) -> Iterator[List[Post]]:
+    for batch in db.scalars(export_posts_statement(**filters)).partitions():
+        yield batch
+        release_posts(db, batch)
+
+def _insert_ignore(db: Session, table):
+    # INSERT ... ON CONFLICT DO NOTHING where the dialect supports it
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+def _ensure_tags(db: Session, tag_names: List[str]):
+    # One IN lookup, then a single bulk insert for whatever is missing.
+    # Concurrent writers creating the same new tag don't conflict.
+    if not tag_names:
+        return
+    existing = set(db.scalars(select(Tag.name).where(Tag.name.in_(tag_names))))
+    missing = [name for name in tag_names if name not in existing]
+    if missing:
+        db.execute(_insert_ignore(db, Tag.__table__), [{"name": name} for name in missing])
+
+def _adjust_tag_counts(db: Session, tag_names, delta: int):
+    if tag_names:
+        db.execute(
+            update(Tag)
+            .where(Tag.name.in_(tag_names))
+            .values(post_count=Tag.post_count + delta)
+        )
+
+def _apply_tag_deltas(db: Session, tag_names: Iterable[str], sign: int = 1):
+    # One UPDATE per distinct increment rather than one per tag
+    by_delta = defaultdict(list)
+    for name, count in Counter(tag_names).items():
+        by_delta[sign * count].append(name)
+    for delta, names in by_delta.items():
+        _adjust_tag_counts(db, names, delta)
+
+def _adjust_author_post_count(db: Session, user_id: str, delta: int):
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(post_count=User.post_count + delta)
+    )
+
+def _add_post_tags(db: Session, post_id: str, tag_names: List[str]):
+    _ensure_tags(db, tag_names)
+    if tag_names:
+        # Counts follow the rows actually inserted, so concurrent updates of
+        # the same post can't double count or trip the primary key
+        added = db.scalars(
+            _insert_ignore(db, post_tag)
+            .values([{"post_id": post_id, "tag_name": name} for name in tag_names])
+            .returning(post_tag.c.tag_name)
+        ).all()
+        _adjust_tag_counts(db, added, 1)
+
+def _remove_post_tags(db: Session, post_id: str, tag_names):
+    if tag_names:
+        removed = db.scalars(
+            delete(post_tag)
+            .where(post_tag.c.post_id == post_id, post_tag.c.tag_name.in_(tag_names))
+            .returning(post_tag.c.tag_name)
+        ).all()
+        _adjust_tag_counts(db, removed, -1)
+
+def derive_content_fields(content: str, excerpt: Optional[str] = None) -> dict:
+    """Columns computed from the markdown body whenever it is written.
+
+    Reads then serve the rendered HTML and stats straight from the row. A
+    given ``excerpt`` is kept, otherwise one is cut from the plain text.
+    """
+    rendered = render_content(content)
+    return {
+        "content_html": rendered.html,
+        "excerpt": excerpt or make_excerpt(rendered.text),
+        "excerpt_derived": not excerpt,
+        "word_count": rendered.word_count,
+        "reading_time_minutes": rendered.reading_time_minutes,
+    }
+
+def _has_derived_excerpt(post: Post) -> bool:
+    # True unless the author wrote the excerpt by hand
+    if not post.excerpt:
+        return True
+    if post.excerpt_derived is not None:
+        return post.excerpt_derived
+    # Rows older than the flag: re-render the old body to find out
+    return post.excerpt in (
+        legacy_excerpt(post.content), make_excerpt(render_content(post.content or "").text)
+    )
+
+def create_post(db: Session, post: PostCreate, user_id: str, derived: Optional[dict] = None):
+    # ``derived`` is derive_content_fields() of the post, if the caller
+    # already rendered it off the event loop
+    published_at = datetime.utcnow()
     db_post = Post(
         title=post.title,
         content=post.content,
-        excerpt=post.excerpt if post.excerpt else post.content[:150] + "...",
         cover_image=post.cover_image,
         author_id=user_id,
-        published_at=datetime.utcnow()
+        published_at=published_at,
+        **(derived or derive_content_fields(post.content, post.excerpt)),
     )
     
-    if tag_objects:
-        db_post.tags = tag_objects
-    
     db.add(db_post)
+    db.flush()
+    _adjust_author_post_count(db, user_id, 1)
+    
+    # Tags are written set-wise to post_tags rather than through the relationship
+    tag_names = list(dict.fromkeys(post.tags or []))
+    _add_post_tags(db, db_post.id, tag_names)
+    db.expire(db_post, ["tags"])
+    
     db.commit()
-    db.refresh(db_post)
-    return db_post
+    response_cache.invalidate()
+    related_index.add(db_post.id, published_at, tag_names)
+    # Re-read through the eager loaders so the result can be serialized
+    # without further lazy loads (required once the session is async)
+    return get_post(db, db_post.id)
+
+def import_posts(
+    db: Session, posts: List[PostCreate], user_id: str, derived: Optional[List[dict]] = None
+) -> List[str]:
+    """Insert a batch of posts in one transaction and return their ids.
+
+    Tags are resolved once for the whole batch and every table is written
+    with a single executemany, instead of the per-post round trips of
+    ``create_post``. ``derived`` holds each post's derive_content_fields(),
+    if the caller already rendered them.
+    """
+    if not posts:
+        return []
+    if derived is None:
+        derived = [derive_content_fields(post.content, post.excerpt) for post in posts]
+    published_at = datetime.utcnow()
+    rows, links, tags = [], [], []
+    for post, fields in zip(posts, derived):
+        post_id = new_id()
+        rows.append({
+            "id": post_id,
+            "title": post.title,
+            "content": post.content,
+            "cover_image": post.cover_image,
+            "author_id": user_id,
+            "published_at": published_at,
+            **fields,
+        })
+        tags.append(list(dict.fromkeys(post.tags or [])))
+        links.extend({"post_id": post_id, "tag_name": name} for name in tags[-1])
+
+    try:
+        db.execute(insert(Post), rows)
+        _adjust_author_post_count(db, user_id, len(rows))
+        if links:
+            _ensure_tags(db, list(dict.fromkeys(link["tag_name"] for link in links)))
+            db.execute(insert(post_tag), links)
+            _apply_tag_deltas(db, (link["tag_name"] for link in links))
+        job_queue.emit(db, POST_IMPORTED, {"post_ids": [row["id"] for row in rows]})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    response_cache.invalidate()
+    for row, tag_names in zip(rows, tags):
+        related_index.add(row["id"], published_at, tag_names)
+    return [row["id"] for row in rows]
+
+@job_queue.on(POST_IMPORTED, debounce=settings.POST_STATISTICS_DEBOUNCE_SECONDS)
+def refresh_post_statistics(db: Session, payload: dict) -> None:
+    """Catch the database's own bookkeeping up with imported posts.
 
-def update_post(db: Session, post_id: str, post_update: PostUpdate, user_id: str):
+    Postgres re-analyzes posts, so plans and ``count=estimated`` see the new
+    rows now instead of whenever autovacuum gets to them; SQLite merges some
+    of the FTS5 index segments the batches left behind. Debounced, so an
+    import runs it once after its last batch rather than once per batch.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("ANALYZE posts"))
+    elif dialect == "sqlite":
+        db.execute(text("INSERT INTO posts_fts(posts_fts, rank) VALUES ('merge', 500)"))
+    db.commit()
+
+def update_post(
+    db: Session, post_id: str, post_update: PostUpdate, user_id: str, derived: Optional[dict] = None
+):
     db_post = get_post(db, post_id)
     
-    if db_post is None or db.query(Post.author_id).filter(Post.id == post_id).scalar() != user_id:
+    if db_post is None or db_post.author_id != user_id:
         return None
     
     update_data = post_update.dict(exclude_unset=True)
     
-    # Update tags if needed
+    # Update tags if needed, only touching post_tags rows that actually change
+    tag_names = None
     if "tags" in update_data:
-        tag_objects = []
-        for tag_name in update_data["tags"]:
-            tag = db.query(Tag).filter(Tag.name == tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.add(tag)
-            tag_objects.append(tag)
+        tag_names = list(dict.fromkeys(update_data.pop("tags") or []))
+        current = {tag.name for tag in db_post.tags}
+        removed = current - set(tag_names)
+        added = [name for name in tag_names if name not in current]
         
-        db_post.tags = tag_objects
-        update_data.pop("tags")
+        _remove_post_tags(db, post_id, removed)
+        _add_post_tags(db, post_id, added)
+        if removed or added:
+            db.expire(db_post, ["tags"])
+    
+    # Derived columns are only recomputed when the body actually changes;
+    # a hand-written excerpt survives, a derived one follows the content
+    new_content = update_data.get("content")
+    if new_content is not None and new_content != db_post.content:
+        keep_excerpt = "excerpt" not in update_data and not _has_derived_excerpt(db_post)
+        update_data.update(derived or derive_content_fields(new_content, update_data.get("excerpt")))
+        if keep_excerpt:
+            del update_data["excerpt"], update_data["excerpt_derived"]
+    elif "excerpt" in update_data:
+        update_data["excerpt_derived"] = not update_data["excerpt"]
     
     # Update the fields
     for field, value in update_data.items():
@@ -86,30 +546,131 @@ def update_post(db: Session, post_id: str, post_update: PostUpdate, user_id: str
     # due to onupdate=func.now() in the model
     
     db.commit()
-    db.refresh(db_post)
-    return db_post
+    response_cache.invalidate()
+    if tag_names is not None:
+        related_index.set_tags(post_id, tag_names)
+    # Re-read through the eager loaders so the result can be serialized
+    # without further lazy loads (required once the session is async)
+    return get_post(db, db_post.id)
 
-def delete_post(db: Session, post_id: str, user_id: str):
-    print(f"Attempting to delete post {post_id} by user {user_id}")
-    
+def _authorize_posts(db: Session, post_ids: List[str], user_id: str) -> Tuple[List[str], Dict[str, str]]:
+    """Split ``post_ids`` into those ``user_id`` owns and per-id refusals."""
+    authors = dict(db.execute(select(Post.id, Post.author_id).where(Post.id.in_(post_ids))).all())
+    owned, outcomes = [], {}
+    for post_id in post_ids:
+        if post_id not in authors:
+            outcomes[post_id] = "not_found"
+        elif authors[post_id] != user_id:
+            outcomes[post_id] = "forbidden"
+        else:
+            owned.append(post_id)
+    return owned, outcomes
+
+def bulk_delete_posts(db: Session, post_ids: List[str], user_id: str) -> Dict[str, str]:
+    """Delete the posts ``user_id`` owns in one transaction.
+
+    Returns an outcome per id: ``deleted``, ``not_found`` or ``forbidden``.
+    Tag links go first so tag counts follow the rows actually removed.
+    """
+    post_ids = list(dict.fromkeys(post_ids))
     try:
-        db_post = db.query(Post).filter(Post.id == post_id).first()
-        
-        if not db_post:
-            print(f"Post {post_id} not found")
-            return False
-        
-        # retrieve the author_id as a scalar value to avoid SQLAlchemy ColumnElement comparisons in Python conditionals
-        db_author_id = db.query(Post.author_id).filter(Post.id == post_id).scalar()
-        if db_author_id != user_id:
-            print(f"User {user_id} is not the author of post {post_id}. Author is {db_author_id}")
-            return False
-        
-        print(f"Deleting post {post_id}")
-        db.delete(db_post)
+        owned, outcomes = _authorize_posts(db, post_ids, user_id)
+        if owned:
+            unlinked = db.scalars(
+                delete(post_tag).where(post_tag.c.post_id.in_(owned)).returning(post_tag.c.tag_name)
+            ).all()
+            _apply_tag_deltas(db, unlinked, -1)
+            # author_id is checked again so a post that changed hands since
+            # the SELECT above is left alone
+            deleted = set(db.scalars(
+                delete(Post)
+                .where(Post.id.in_(owned), Post.author_id == user_id)
+                .returning(Post.id)
+                .execution_options(synchronize_session=False)
+            ))
+            _adjust_author_post_count(db, user_id, -len(deleted))
+            for post_id in owned:
+                outcomes[post_id] = "deleted" if post_id in deleted else "not_found"
         db.commit()
-        return True
-    except Exception as e:
-        print(f"Error deleting post: {str(e)}")
+    except Exception:
+        logger.exception("bulk post delete failed", extra={"user_id": user_id, "posts": len(post_ids)})
+        db.rollback()
+        raise
+    if owned:
+        response_cache.invalidate()
+        for post_id in deleted:
+            related_index.remove(post_id)
+        logger.info("posts deleted", extra={"user_id": user_id, "posts": len(deleted)})
+    return {post_id: outcomes[post_id] for post_id in post_ids}
+
+def bulk_update_posts(db: Session, changes: PostBulkUpdate, user_id: str) -> Dict[str, str]:
+    """Apply the same field and tag changes to every post ``user_id`` owns.
+
+    Each kind of change is one statement over the whole set; returns an
+    outcome per id: ``updated``, ``not_found`` or ``forbidden``.
+    """
+    post_ids = list(dict.fromkeys(changes.ids))
+    fields = changes.model_dump(include={"title", "excerpt", "cover_image"}, exclude_unset=True)
+    if "excerpt" in fields:
+        fields["excerpt_derived"] = not fields["excerpt"]
+    retagged: Dict[str, List[str]] = {}
+    try:
+        owned, outcomes = _authorize_posts(db, post_ids, user_id)
+        if owned:
+            if fields:
+                db.execute(
+                    update(Post)
+                    .where(Post.id.in_(owned), Post.author_id == user_id)
+                    .values(**fields)
+                    .execution_options(synchronize_session=False)
+                )
+
+            remove_tags = changes.remove_tags
+            add_tags = changes.add_tags
+            if changes.tags is not None:
+                add_tags = list(dict.fromkeys(changes.tags))
+            if changes.tags is not None or remove_tags:
+                condition = (
+                    post_tag.c.tag_name.not_in(add_tags) if changes.tags is not None
+                    else post_tag.c.tag_name.in_(remove_tags)
+                )
+                unlinked = db.scalars(
+                    delete(post_tag)
+                    .where(post_tag.c.post_id.in_(owned), condition)
+                    .returning(post_tag.c.tag_name)
+                ).all()
+                _apply_tag_deltas(db, unlinked, -1)
+            if add_tags:
+                _ensure_tags(db, add_tags)
+                # Links that already exist are skipped and not counted
+                linked = db.scalars(
+                    _insert_ignore(db, post_tag)
+                    .values([{"post_id": post_id, "tag_name": name} for post_id in owned for name in add_tags])
+                    .returning(post_tag.c.tag_name)
+                ).all()
+                _apply_tag_deltas(db, linked)
+            if changes.tags is not None or remove_tags or add_tags:
+                # The resulting tag sets, for the related-posts index
+                retagged = {post_id: [] for post_id in owned}
+                for post_id, tag_name in db.execute(
+                    select(post_tag.c.post_id, post_tag.c.tag_name).where(post_tag.c.post_id.in_(owned))
+                ):
+                    retagged[post_id].append(tag_name)
+
+            for post_id in owned:
+                outcomes[post_id] = "updated"
+        db.commit()
+    except Exception:
         db.rollback()
-        raise e
+        raise
+    if owned:
+        response_cache.invalidate()
+        for post_id, tag_names in retagged.items():
+            related_index.set_tags(post_id, tag_names)
+    return {post_id: outcomes[post_id] for post_id in post_ids}
+
+def delete_post(db: Session, post_id: str, user_id: str):
+    outcome = bulk_delete_posts(db, [post_id], user_id)[post_id]
+    if outcome != "deleted":
+        logger.info("post delete refused", extra={"post_id": post_id, "user_id": user_id, "reason": outcome})
+    return outcome == "deleted"
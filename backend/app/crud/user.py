@@ -1,8 +1,12 @@
+import logging
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import principal_cache, response_cache
+from app.core.security import get_password_hash, verify_and_update_password
+
+logger = logging.getLogger(__name__)
 
 def get_user(
     db: Session,
@@ -25,9 +29,11 @@ def get_user(
 
     return query.first()
 
-def create_user(db: Session, user: UserCreate):
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None):
+    # API callers hash on the password pool and pass the result in
     try:
-        hashed_password = get_password_hash(user.password)
+        if hashed_password is None:
+            hashed_password = get_password_hash(user.password)
         db_user = User(
             email=user.email,
             username=user.username,
@@ -39,11 +45,11 @@ def create_user(db: Session, user: UserCreate):
         db.refresh(db_user)
         return db_user
     except Exception as e:
-        print(f"Error creating user: {str(e)}")
+        logger.exception("user create failed", extra={"username": user.username})
         db.rollback()
         raise e
 
-def update_user(db: Session, user_id: str, user: UserUpdate):
+def update_user(db: Session, user_id: str, user: UserUpdate, hashed_password: Optional[str] = None):
     db_user = get_user(db, user_id=user_id)
     if not db_user:
         return None
@@ -51,19 +57,43 @@ def update_user(db: Session, user_id: str, user: UserUpdate):
     update_data = user.dict(exclude_unset=True)
     
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        password = update_data.pop("password")
+        update_data["hashed_password"] = hashed_password or get_password_hash(password)
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
     db.commit()
+    principal_cache.invalidate_user(user_id)
+    response_cache.invalidate()
+    db.refresh(db_user)
+    return db_user
+
+def deactivate_user(db: Session, user_id: str):
+    db_user = get_user(db, user_id=user_id)
+    if not db_user:
+        return None
+    
+    db_user.is_active = False
+    db.commit()
+    principal_cache.invalidate_user(user_id)
+    response_cache.invalidate()
     db.refresh(db_user)
     return db_user
 
+def update_password_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+    return user
+
 def authenticate_user(db: Session, username: str, password: str):
     user = get_user(db, username=username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        user = update_password_hash(db, user, new_hash)
     return user
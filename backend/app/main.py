@@ -1,16 +1,29 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import math
+from contextlib import asynccontextmanager
+from time import perf_counter
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+from starlette.concurrency import run_in_threadpool
 
-from app.api.endpoints import auth, users, posts
+from app.api.related import refresh_related_index
+from app.api.responses import ORJSONResponse
 from app.core.config import settings
-
-app = FastAPI(
-    title="commonminds API",
-    description="API for commonminds platform",
-    version="0.1.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    debug=True  # Enable debug mode to see 500 errors in response
+from app.core.database import (
+    dispose_engines, get_replicas, monitor_replicas, warm_async_connections, warm_connections,
 )
+from app.core.instrumentation import RequestTimingMiddleware
+from app.core.jobs import job_queue
+from app.core.logging import configure_logging
+from app.core.ratelimit import RateLimitExceeded
+from app.core.replicas import READ_PRIMARY_FOR_HEADER, ReadYourWritesMiddleware
+from app.core.security import PasswordHasherBusy, create_access_token, password_hasher
+
+logger = logging.getLogger(__name__)
 
 # CORS configuration
 origins = [
@@ -19,20 +32,137 @@ origins = [
     "http://localhost:8000",
 ]
 
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-# Include API routes
-app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
-app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
-app.include_router(posts.router, prefix=f"{settings.API_V1_STR}/posts", tags=["posts"])
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests, please retry later"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+async def warm_up() -> None:
+    """Pay the one-off costs of the first request before serving it.
+
+    Only costs that don't grow with the data: the related-posts index is
+    built by the first request that needs it, and the job workers start
+    with the first job (see ``resume_jobs``).
+    """
+    start = perf_counter()
+    # Resolve the model relationships now rather than inside the first query
+    configure_mappers()
+    # Builds the engine, then opens DATABASE_WARM_CONNECTIONS of its pool
+    if settings.DATABASE_ASYNC:
+        connections = await warm_async_connections(settings.DATABASE_WARM_CONNECTIONS)
+    else:
+        connections = await run_in_threadpool(warm_connections, settings.DATABASE_WARM_CONNECTIONS)
+    if settings.PASSWORD_HASH_PREWARM:
+        await password_hasher.warm_up()
+        # Loads the JWT library the first login would otherwise import
+        create_access_token({"sub": "warm-up"})
+    logger.info(
+        "startup warm-up done",
+        extra={
+            "duration_ms": round((perf_counter() - start) * 1000, 1),
+            "connections": connections,
+            "password_hasher": settings.PASSWORD_HASH_PREWARM,
+        },
+    )
+
+
+async def resume_jobs() -> None:
+    # Jobs a previous run left in the outbox would otherwise wait for this
+    # process to enqueue one; checked after startup, not during it
+    await asyncio.sleep(settings.JOBS_POLL_SECONDS)
+    try:
+        await run_in_threadpool(job_queue.resume)
+    except SQLAlchemyError:
+        # e.g. migrations not applied yet; the first enqueued job starts them
+        logger.exception("job outbox check failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up()
+    tasks = [asyncio.create_task(resume_jobs())]
+    if get_replicas() is not None:
+        tasks.append(asyncio.create_task(monitor_replicas()))
+    if settings.RELATED_POSTS_REFRESH_SECONDS > 0:
+        tasks.append(asyncio.create_task(refresh_related_index()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await run_in_threadpool(job_queue.shutdown)
+    password_hasher.shutdown()
+    await dispose_engines()
+
 
-@app.get("/")
 def read_root():
     return {"message": "Welcome to commonminds API"}
+
+
+def create_app() -> FastAPI:
+    """Build the API application.
+
+    Nothing here touches the database: the engine is built by the lifespan
+    hook (or by the first request on servers that skip lifespan events).
+    """
+    # Routers pull in the models, crud and schemas; import them with the app
+    from app.api.endpoints import auth, users, posts, tags, metrics
+
+    configure_logging()
+
+    app = FastAPI(
+        title="commonminds API",
+        description="API for commonminds platform",
+        version="0.1.0",
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        # Untyped routes; response-model routes return pre-serialized bodies
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+        debug=True  # Enable debug mode to see 500 errors in response
+    )
+
+    # Enable CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Read by the frontend to keep its reads on the primary after a write
+        expose_headers=[READ_PRIMARY_FOR_HEADER],
+    )
+
+    # Per-request wall time, SQL count and DB time (Server-Timing, slow logs, metrics)
+    app.add_middleware(RequestTimingMiddleware)
+
+    if settings.DATABASE_REPLICA_URLS:
+        # Sends reads to the primary for a while after a client writes
+        app.add_middleware(ReadYourWritesMiddleware)
+
+    app.add_exception_handler(PasswordHasherBusy, password_hasher_busy_handler)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+
+    # Include API routes
+    app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
+    app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
+    app.include_router(posts.router, prefix=f"{settings.API_V1_STR}/posts", tags=["posts"])
+    app.include_router(tags.router, prefix=f"{settings.API_V1_STR}/tags", tags=["tags"])
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics.router, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"])
+
+    app.get("/")(read_root)
+    return app
+
+
+# Entry point for uvicorn and the Vercel build (app.main:app)
+app = create_app()
@@ -0,0 +1,29 @@
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from app.core.database import Base
+from app.core.ids import new_id
+from app.models.types import UUIDString
+
+
+class OutboxJob(Base):
+    """A background job. Written in the same transaction as the change that
+    caused it and deleted once it has run (see app.core.jobs)."""
+
+    __tablename__ = "job_outbox"
+
+    id = Column(UUIDString, primary_key=True, default=new_id)
+    name = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    # "pending" until it has run; "failed" once out of attempts, kept for
+    # inspection and manual retry
+    status = Column(String, nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, nullable=False)
+    # Not run before this; every retry pushes it back
+    run_at = Column(DateTime, nullable=False)
+    # Set while a worker holds the job; a lease that runs out means the
+    # worker died and the job is up for grabs again
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    # The poller's scan for due jobs
+    __table_args__ = (Index("ix_job_outbox_status_run_at", "status", "run_at"),)
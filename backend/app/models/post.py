@@ -1,38 +1,112 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Table
-from sqlalchemy.sql import func
+from sqlalchemy import Boolean, Column, String, Text, Integer, ForeignKey, DateTime, Table, Index, DDL, event
+from sqlalchemy.sql import func, table, column
 from sqlalchemy.orm import relationship
-from uuid import uuid4
 from app.core.database import Base
+from app.core.ids import new_id
+from app.models.types import UUIDString
 
 # Many-to-many relationship for posts and tags
 post_tag = Table(
     "post_tags",
     Base.metadata,
-    Column("post_id", String, ForeignKey("posts.id")),
-    Column("tag_name", String, ForeignKey("tags.name"))
+    Column("post_id", UUIDString, ForeignKey("posts.id"), primary_key=True),
+    Column("tag_name", String, ForeignKey("tags.name"), primary_key=True),
+    # The primary key serves post -> tags; this serves tag -> posts
+    Index("ix_post_tags_tag_name_post_id", "tag_name", "post_id"),
 )
 
 class Tag(Base):
     __tablename__ = "tags"
     
     name = Column(String, primary_key=True)
+    # Maintained by app.crud.post whenever post_tags rows change
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
     posts = relationship("Post", secondary=post_tag, back_populates="tags")
 
 class Post(Base):
     __tablename__ = "posts"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid4()))
+    id = Column(UUIDString, primary_key=True, default=new_id)
     title = Column(String, index=True)
     content = Column(Text)
     excerpt = Column(String, nullable=True)
     cover_image = Column(String, nullable=True)
+    # Derived from content whenever it is written (app.crud.post); NULL only
+    # for rows that predate them until app.cli.backfill_content has run
+    content_html = Column(Text, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    reading_time_minutes = Column(Integer, nullable=True)
+    # Whether the excerpt was cut from the content rather than written by the
+    # author, so an edit to the body knows whether to replace it. NULL for
+    # rows written before it existed
+    excerpt_derived = Column(Boolean, nullable=True)
     published_at = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Foreign Keys
-    author_id = Column(String, ForeignKey("users.id"))
+    author_id = Column(UUIDString, ForeignKey("users.id"))
     
     # Relationships
     author = relationship("User", back_populates="posts")
     tags = relationship("Tag", secondary=post_tag, back_populates="posts")
+
+    # Keyset pagination seeks on (published_at, id), globally and per author
+    __table_args__ = (
+        Index("ix_posts_published_at_id", "published_at", "id"),
+        Index("ix_posts_author_id_published_at_id", "author_id", "published_at", "id"),
+    )
+
+
+# Full-text search is maintained by the database itself: a generated, GIN
+# indexed tsvector column on Postgres and an FTS5 table kept in sync by
+# triggers on SQLite. The migration runs the same statements.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE posts_fts USING fts5(
+        title, excerpt, content, content='posts', content_rowid='rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, excerpt, content)
+        VALUES (new.rowid, new.title, new.excerpt, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.rowid, old.title, old.excerpt, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, excerpt, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.rowid, old.title, old.excerpt, old.content);
+        INSERT INTO posts_fts(rowid, title, excerpt, content)
+        VALUES (new.rowid, new.title, new.excerpt, new.content);
+    END
+    """,
+]
+
+# Lightweight handle on the SQLite FTS5 table for queries
+posts_fts = table("posts_fts", column("rowid"))
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Post.__table__, "before_drop", DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite")
+)
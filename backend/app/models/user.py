@@ -1,19 +1,22 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-from uuid import uuid4
 from datetime import datetime
 from app.core.database import Base
+from app.core.ids import new_id
+from app.models.types import UUIDString
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String, primary_key=True, index=True, default=lambda: str(uuid4()))
+    id = Column(UUIDString, primary_key=True, index=True, default=new_id)
     username = Column(String, unique=True, index=True)
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String)
     avatar = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Maintained by app.crud.post in the same transaction as post writes
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
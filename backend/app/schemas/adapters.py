@@ -0,0 +1,36 @@
+from functools import lru_cache
+from typing import Any, List
+from pydantic import BaseModel, TypeAdapter
+from app.schemas.post import (
+    Post, PostBulkResult, PostList, PostSummary, PostSummaryList, PostSearchList, PostImportResult,
+    TagWithCount,
+)
+from app.schemas.user import Token, User
+
+
+@lru_cache(maxsize=None)
+def get_adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+# Build the validators/serializers for every response shape at import time
+# rather than on the first request that needs them
+RESPONSE_TYPES = (
+    Post, PostList, PostSummaryList, PostSearchList, PostImportResult, PostBulkResult,
+    List[PostSummary], List[TagWithCount], User, Token,
+)
+for _tp in RESPONSE_TYPES:
+    get_adapter(_tp)
+
+
+def dump_json(tp: Any, data: Any) -> bytes:
+    """Serialize ``data`` as ``tp`` straight to JSON bytes.
+
+    ORM rows are validated exactly once (``from_attributes``); an instance
+    of ``tp`` that was already built by the server is trusted and only
+    serialized.
+    """
+    adapter = get_adapter(tp)
+    if not (isinstance(tp, type) and issubclass(tp, BaseModel) and isinstance(data, tp)):
+        data = adapter.validate_python(data, from_attributes=True)
+    return adapter.dump_json(data)
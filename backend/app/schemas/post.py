@@ -1,6 +1,7 @@
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
+from app.core.ids import InputId
 from app.schemas.user import User
 
 class TagBase(BaseModel):
@@ -10,6 +11,9 @@ class Tag(TagBase):
     class Config:
         from_attributes = True
 
+class TagWithCount(Tag):
+    post_count: int
+
 class PostBase(BaseModel):
     title: str
     content: str
@@ -29,6 +33,9 @@ class PostUpdate(BaseModel):
 
 class PostInDB(PostBase):
     id: str
+    content_html: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time_minutes: Optional[int] = None
     published_at: datetime
     author_id: str
     updated_at: Optional[datetime] = None  # Add updated_at field
@@ -43,9 +50,87 @@ class Post(PostInDB):
     class Config:
         from_attributes = True
 
+class PostSummary(BaseModel):
+    # List view projection: everything but the post body
+    id: str
+    title: str
+    excerpt: Optional[str] = None
+    cover_image: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time_minutes: Optional[int] = None
+    published_at: datetime
+    updated_at: Optional[datetime] = None
+    author_id: str
+    author: User
+    tags: List[Tag] = []
+    
+    class Config:
+        from_attributes = True
+
 class PostList(BaseModel):
     items: List[Post]
+    total: Optional[int] = None  # Not computed in cursor mode or with count=none
+    total_exact: Optional[bool] = None
+    page: Optional[int] = None
+    size: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class PostSummaryList(PostList):
+    items: List[PostSummary]
+
+class PostSearchResult(Post):
+    score: float = 0.0
+
+class PostSearchList(BaseModel):
+    items: List[PostSearchResult]
     total: int
     page: int
     size: int
     pages: int
+
+class PostImportError(BaseModel):
+    line: int
+    error: str
+
+class PostImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[PostImportError] = []
+
+# Bulk operations take at most this many ids per request
+BULK_MAX_POSTS = 500
+
+class PostBulkDelete(BaseModel):
+    ids: List[InputId] = Field(..., min_length=1, max_length=BULK_MAX_POSTS)
+
+class PostBulkUpdate(BaseModel):
+    ids: List[InputId] = Field(..., min_length=1, max_length=BULK_MAX_POSTS)
+    title: Optional[str] = None
+    excerpt: Optional[str] = None
+    cover_image: Optional[str] = None
+    # Either replace the tag set outright, or add/remove individual tags
+    tags: Optional[List[str]] = None
+    add_tags: List[str] = []
+    remove_tags: List[str] = []
+
+    @field_validator("title")
+    @classmethod
+    def check_title(cls, value: Optional[str]) -> Optional[str]:
+        # Omitted means unchanged; posts.title can't be cleared
+        if value is None:
+            raise ValueError("title cannot be null")
+        return value
+
+    @model_validator(mode="after")
+    def check_tag_changes(self):
+        if self.tags is not None and (self.add_tags or self.remove_tags):
+            raise ValueError("tags cannot be combined with add_tags or remove_tags")
+        return self
+
+class PostBulkOutcome(BaseModel):
+    id: str
+    status: Literal["deleted", "updated", "not_found", "forbidden"]
+
+class PostBulkResult(BaseModel):
+    results: List[PostBulkOutcome]
@@ -1,6 +1,11 @@
-from typing import Optional
+from typing import Annotated, Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, WithJsonSchema
+
+# Addresses are checked by EmailStr on the way in; rows read back from the
+# database are trusted, since email-validator costs ~150us per value and
+# every post in a list embeds its author
+StoredEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
 
 class UserBase(BaseModel):
     username: str
@@ -18,6 +23,7 @@ class UserUpdate(BaseModel):
 
 class UserInDB(UserBase):
     id: str
+    email: StoredEmail
     is_active: bool = True
     created_at: datetime  # Add created_at field here
 
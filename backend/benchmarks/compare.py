@@ -0,0 +1,53 @@
+"""Compare two benchmark result files scenario by scenario.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+from typing import Optional
+
+METRICS = (
+    ("throughput_rps", lambda r: r["throughput_rps"], True),
+    ("p50_ms", lambda r: r["latency_ms"]["p50"], False),
+    ("p95_ms", lambda r: r["latency_ms"]["p95"], False),
+    ("p99_ms", lambda r: r["latency_ms"]["p99"], False),
+    ("queries", lambda r: r["queries_per_request"]["mean"], False),
+)
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"{before['meta'].get('git_revision')} -> {after['meta'].get('git_revision')}")
+    for name in sorted(set(before["scenarios"]) | set(after["scenarios"])):
+        old, new = before["scenarios"].get(name), after["scenarios"].get(name)
+        if old is None or new is None:
+            print(f"{name:<20} only in {'after' if old is None else 'before'}")
+            continue
+        cells = []
+        for label, get, higher_is_better in METRICS:
+            change = _change(get(old), get(new))
+            marker = ""
+            if change is not None and abs(change) >= 5:
+                marker = "+" if (change > 0) == higher_is_better else "-"
+            shown = f"{change:+.1f}%" if change is not None else "n/a"
+            cells.append(f"{label} {get(old)} -> {get(new)} ({shown}){marker}")
+        print(f"{name:<20} " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Synthetic dataset generator for the benchmark suite.
+
+Seeds users, posts and tags straight through SQLAlchemy Core so large
+datasets load quickly, while keeping the maintained columns (tag and author
+post counts) consistent with what the crud layer would have written.
+"""
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.engine import Engine
+
+from app.core.database import Base
+from app.core.ids import new_id
+from app.core.security import get_password_hash
+from app.models.post import Post, Tag, post_tag
+from app.models.user import User
+
+BENCH_PASSWORD = "benchmark-password"
+
+WORDS = (
+    "the of and to in is for that with on as by this are be from at or an it "
+    "python rust database query index cache latency throughput request server "
+    "client async thread pool memory disk network design system performance "
+    "model schema migration table column row transaction commit rollback lock "
+    "markdown editor publish draft author reader story idea write code test "
+    "deploy release feature review bug fix refactor build docker cloud edge"
+).split()
+
+
+@dataclass
+class DatasetConfig:
+    users: int = 50
+    posts: int = 2000
+    tags: int = 200
+    tags_per_post: int = 4
+    # Post bodies follow a log-normal size distribution (bytes), capped
+    content_median: int = 4000
+    content_sigma: float = 1.0
+    content_max: int = 200_000
+    seed: int = 1234
+
+
+@dataclass
+class Dataset:
+    config: DatasetConfig
+    user_ids: List[str] = field(default_factory=list)
+    usernames: List[str] = field(default_factory=list)
+    post_ids: List[str] = field(default_factory=list)
+    tag_names: List[str] = field(default_factory=list)
+
+
+def _paragraphs(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    # Break into markdown-ish paragraphs of ~80 words
+    return "\n\n".join(" ".join(words[i:i + 80]) for i in range(0, len(words), 80))
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return [1 / math.pow(rank, s) for rank in range(1, n + 1)]
+
+
+def seed_database(engine: Engine, config: DatasetConfig, batch_size: int = 500) -> Dataset:
+    """Recreate the schema on ``engine`` and fill it with a synthetic dataset."""
+    rng = random.Random(config.seed)
+    dataset = Dataset(config=config)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # Argon2 is deliberately slow; every benchmark user shares one hash
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    users = []
+    for i in range(config.users):
+        user_id = new_id()
+        username = f"bench_user_{i}"
+        dataset.user_ids.append(user_id)
+        dataset.usernames.append(username)
+        users.append({
+            "id": user_id,
+            "username": username,
+            "email": f"{username}@example.com",
+            "hashed_password": hashed_password,
+            "is_active": True,
+            "created_at": now - timedelta(days=365),
+            "post_count": 0,
+        })
+
+    dataset.tag_names = [f"tag-{i}" for i in range(config.tags)]
+    tag_weights = _zipf_weights(config.tags)
+    # A few prolific authors write most posts
+    author_weights = _zipf_weights(config.users, s=0.8)
+
+    tag_counts: Dict[str, int] = {name: 0 for name in dataset.tag_names}
+    author_counts: Dict[str, int] = {user_id: 0 for user_id in dataset.user_ids}
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), users)
+        conn.execute(insert(Tag.__table__), [{"name": name, "post_count": 0} for name in dataset.tag_names])
+
+        for start in range(0, config.posts, batch_size):
+            posts, links = [], []
+            for i in range(start, min(start + batch_size, config.posts)):
+                post_id = new_id()
+                author_id = rng.choices(dataset.user_ids, weights=author_weights)[0]
+                size = int(min(config.content_max, rng.lognormvariate(math.log(config.content_median), config.content_sigma)))
+                content = _paragraphs(rng, max(size, 200))
+                published_at = now - timedelta(minutes=(config.posts - i) * 7)
+                posts.append({
+                    "id": post_id,
+                    "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9))).capitalize(),
+                    "content": content,
+                    "excerpt": content[:150],
+                    "cover_image": None,
+                    "author_id": author_id,
+                    "published_at": published_at,
+                    "created_at": published_at,
+                })
+                tags = set(rng.choices(dataset.tag_names, weights=tag_weights, k=rng.randint(0, config.tags_per_post * 2)))
+                links.extend({"post_id": post_id, "tag_name": name} for name in tags)
+                for name in tags:
+                    tag_counts[name] += 1
+                author_counts[author_id] += 1
+                dataset.post_ids.append(post_id)
+
+            conn.execute(insert(Post.__table__), posts)
+            if links:
+                conn.execute(insert(post_tag), links)
+
+        conn.execute(
+            update(Tag.__table__)
+            .where(Tag.__table__.c.name == bindparam("tag_name"))
+            .values(post_count=bindparam("count")),
+            [{"tag_name": name, "count": count} for name, count in tag_counts.items()],
+        )
+        conn.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == bindparam("user_id"))
+            .values(post_count=bindparam("count")),
+            [{"user_id": user_id, "count": count} for user_id, count in author_counts.items()],
+        )
+
+    return dataset
+
+
+def load_dataset(engine: Engine, config: DatasetConfig) -> Dataset:
+    """Describe an already seeded database so a run can skip seeding."""
+    dataset = Dataset(config=config)
+    with engine.connect() as conn:
+        for user_id, username in conn.execute(
+            User.__table__.select().with_only_columns(User.id, User.username).where(User.username.like("bench_user_%"))
+        ):
+            dataset.user_ids.append(user_id)
+            dataset.usernames.append(username)
+        dataset.post_ids = list(conn.scalars(Post.__table__.select().with_only_columns(Post.id)))
+        dataset.tag_names = list(conn.scalars(
+            Tag.__table__.select().with_only_columns(Tag.name).order_by(Tag.post_count.desc())
+        ))
+    return dataset
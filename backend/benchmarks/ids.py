@@ -0,0 +1,178 @@
+"""Compare primary-key layouts for insert throughput and index size.
+
+Each variant gets a posts-shaped table (id primary key, author id, the keyset
+indexes on (published_at, id) and (author_id, published_at, id)) and a
+post_tags-shaped link table, filled in batches of one transaction each, the
+way ``import_posts`` writes:
+
+    cd backend
+    python -m benchmarks.ids --rows 200000 --output ids.json
+    python -m benchmarks.ids --database-url postgresql://localhost/blogi_bench
+
+Variants:
+
+    uuid4-text    random uuid4 as 36 characters of text (the old layout)
+    uuid7-text    time-ordered UUIDv7 as text
+    uuid4-native  random uuid4 in the native/binary column
+    uuid7-native  UUIDv7 in the native/binary column (the current layout)
+
+The benchmark **drops and recreates** its own ``bench_ids_*`` tables.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, Tuple
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, MetaData, String, Table, create_engine, insert, text
+from sqlalchemy.engine import Engine
+
+from app.core.ids import uuid7
+from app.models.types import UUIDString
+
+VARIANTS: Dict[str, Tuple[Callable[[], uuid.UUID], Any]] = {
+    "uuid4-text": (uuid.uuid4, String),
+    "uuid7-text": (uuid7, String),
+    "uuid4-native": (uuid.uuid4, UUIDString),
+    "uuid7-native": (uuid7, UUIDString),
+}
+
+
+def _tables(name: str, id_type: Any) -> Tuple[MetaData, Table, Table]:
+    prefix = "bench_ids_" + name.replace("-", "_")
+    metadata = MetaData()
+    posts = Table(
+        f"{prefix}_posts", metadata,
+        Column("id", id_type, primary_key=True),
+        Column("author_id", id_type, nullable=False),
+        Column("published_at", DateTime(timezone=True), nullable=False),
+        Column("title", String, nullable=False),
+        Index(f"ix_{prefix}_published_at_id", "published_at", "id"),
+        Index(f"ix_{prefix}_author_id_published_at_id", "author_id", "published_at", "id"),
+    )
+    links = Table(
+        f"{prefix}_post_tags", metadata,
+        Column("post_id", id_type, ForeignKey(posts.c.id), primary_key=True),
+        Column("tag_name", String, primary_key=True),
+        Index(f"ix_{prefix}_tag_name_post_id", "tag_name", "post_id"),
+    )
+    return metadata, posts, links
+
+
+def _sizes(engine: Engine, posts: Table, links: Table) -> Dict[str, int]:
+    """Bytes used by the tables and, separately, by all of their indexes."""
+    names = (posts.name, links.name)
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            table_bytes = sum(conn.scalar(text("SELECT pg_relation_size(:t)"), {"t": name}) for name in names)
+            index_bytes = sum(conn.scalar(text("SELECT pg_indexes_size(:t)"), {"t": name}) for name in names)
+        elif engine.dialect.name == "sqlite":
+            # dbstat attributes every b-tree page, including the automatic
+            # indexes behind the primary keys, to its table or index
+            rows = conn.execute(text(
+                "SELECT m.type, sum(s.pgsize) FROM dbstat s JOIN sqlite_master m ON m.name = s.name "
+                "WHERE m.tbl_name IN (:posts, :links) GROUP BY m.type"
+            ), {"posts": posts.name, "links": links.name}).all()
+            table_bytes = sum(size for kind, size in rows if kind == "table")
+            index_bytes = sum(size for kind, size in rows if kind == "index")
+        else:
+            raise SystemExit(f"Index sizes aren't supported on {engine.dialect.name}")
+    return {"table_bytes": int(table_bytes), "index_bytes": int(index_bytes)}
+
+
+def run_variant(engine: Engine, name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    make_id, id_type = VARIANTS[name]
+    metadata, posts, links = _tables(name, id_type)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    rng = random.Random(args.seed)
+    authors = [str(make_id()) for _ in range(args.authors)]
+    tags = [f"tag-{i}" for i in range(args.tags)]
+    start_at = datetime.now(timezone.utc) - timedelta(minutes=args.rows)
+
+    elapsed = 0.0
+    for start in range(0, args.rows, args.batch_size):
+        rows, link_rows = [], []
+        for i in range(start, min(start + args.batch_size, args.rows)):
+            post_id = str(make_id())
+            rows.append({
+                "id": post_id,
+                "author_id": rng.choice(authors),
+                "published_at": start_at + timedelta(minutes=i),
+                "title": f"post {i}",
+            })
+            link_rows.extend({"post_id": post_id, "tag_name": tag} for tag in rng.sample(tags, args.tags_per_post))
+        # Only the database round trips are timed, not building the rows
+        begin = perf_counter()
+        with engine.begin() as conn:
+            conn.execute(insert(posts), rows)
+            conn.execute(insert(links), link_rows)
+        elapsed += perf_counter() - begin
+
+    result = {"rows_per_second": round(args.rows / elapsed), "seconds": round(elapsed, 3)}
+    result.update(_sizes(engine, posts, links))
+    if not args.keep:
+        metadata.drop_all(engine)
+    return result
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", "sqlite:///./bench_ids.db"))
+    parser.add_argument("--rows", type=int, default=100000, help="posts per variant")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="comma separated subset of: " + ", ".join(VARIANTS))
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--keep", action="store_true", help="leave the tables in place afterwards")
+    parser.add_argument("--output", help="write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    variants = args.variants.split(",")
+    unknown = [name for name in variants if name not in VARIANTS]
+    if unknown:
+        raise SystemExit(f"Unknown variants: {', '.join(unknown)}")
+
+    engine = create_engine(args.database_url)
+    results: Dict[str, Any] = {}
+    for name in variants:
+        results[name] = result = run_variant(engine, name, args)
+        print(
+            f"{name:<13} {result['rows_per_second']:>8} rows/s  "
+            f"table {result['table_bytes'] / 2**20:>7.1f} MiB  index {result['index_bytes'] / 2**20:>7.1f} MiB",
+            file=sys.stderr,
+        )
+    engine.dispose()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "rows": args.rows,
+            "batch_size": args.batch_size,
+            "tags_per_post": args.tags_per_post,
+        },
+        "variants": results,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""Drive every API route in-process and report latency and query counts.
+
+Seeds a synthetic dataset, then sends requests through an in-process ASGI
+client at a fixed concurrency, one scenario per route shape:
+
+    cd backend
+    python -m benchmarks.run --posts 5000 --concurrency 16 --output bench.json
+    python -m benchmarks.compare before.json after.json
+
+Results are written as sorted, indented JSON so runs diff cleanly.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Counts SQL statements issued on behalf of the request being timed; the list
+# is shared by reference so threadpool and greenlet hops still reach it
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("bench_query_counter", default=None)
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+# Posts per import request, and ids per bulk update/delete request
+IMPORT_POSTS = 50
+BULK_POSTS = 20
+
+
+@dataclass
+class State:
+    dataset: Any
+    rng: random.Random
+    token: str = ""
+    own_posts: List[str] = field(default_factory=list)
+    registered: int = 0
+
+    @property
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def post_id(self) -> str:
+        return self.rng.choice(self.dataset.post_ids)
+
+    def user_id(self) -> str:
+        return self.rng.choice(self.dataset.user_ids)
+
+    def tag(self) -> str:
+        # Favour popular tags, like real traffic does
+        return self.dataset.tag_names[min(int(self.rng.expovariate(0.1)), len(self.dataset.tag_names) - 1)]
+
+
+def _post_body(state: State) -> Dict[str, Any]:
+    return {
+        "title": f"Benchmark post {state.rng.random()}",
+        "content": "benchmark content " * state.rng.randint(50, 500),
+        "tags": [state.tag() for _ in range(3)],
+    }
+
+
+def _create_post(state: State) -> Request:
+    return "POST", "/posts/", {"json": _post_body(state), "headers": state.auth}
+
+
+def _import_posts(state: State) -> Request:
+    body = "\n".join(json.dumps(_post_body(state)) for _ in range(IMPORT_POSTS))
+    headers = {**state.auth, "Content-Type": "application/x-ndjson"}
+    return "POST", "/posts/import", {"content": body.encode(), "headers": headers}
+
+
+def _export_posts(state: State) -> Request:
+    # One author's posts; Zipf authors make some of these large
+    return "GET", f"/posts/export?author={state.user_id()}", {"headers": state.auth}
+
+
+def _update_post(state: State) -> Request:
+    post_id = state.rng.choice(state.own_posts)
+    body = {"title": f"Updated {state.rng.random()}", "tags": [state.tag() for _ in range(3)]}
+    return "PATCH", f"/posts/{post_id}", {"json": body, "headers": state.auth}
+
+
+def _bulk_update_posts(state: State) -> Request:
+    body = {"ids": state.rng.sample(state.own_posts, BULK_POSTS), "add_tags": [state.tag()]}
+    return "POST", "/posts/bulk-update", {"json": body, "headers": state.auth}
+
+
+def _delete_post(state: State) -> Request:
+    return "DELETE", f"/posts/{state.own_posts.pop()}", {"headers": state.auth}
+
+
+def _bulk_delete_posts(state: State) -> Request:
+    ids = [state.own_posts.pop() for _ in range(BULK_POSTS)]
+    return "POST", "/posts/bulk-delete", {"json": {"ids": ids}, "headers": state.auth}
+
+
+def _register(state: State) -> Request:
+    state.registered += 1
+    name = f"bench_reg_{os.getpid()}_{state.registered}_{state.rng.randint(0, 10**9)}"
+    body = {"username": name, "email": f"{name}@example.com", "password": "benchmark-password"}
+    return "POST", "/auth/register", {"json": body}
+
+
+def _login(state: State) -> Request:
+    from benchmarks.dataset import BENCH_PASSWORD
+
+    form = {"username": state.rng.choice(state.dataset.usernames), "password": BENCH_PASSWORD}
+    return "POST", "/auth/login", {"data": form}
+
+
+# name -> (request builder, is an Argon2-bound auth route)
+SCENARIOS: Dict[str, Tuple[Callable[[State], Request], bool]] = {
+    "list_posts": (lambda s: ("GET", f"/posts/?page={s.rng.randint(1, 20)}&limit=10", {}), False),
+    "list_posts_cursor": (lambda s: ("GET", "/posts/?cursor=&limit=10", {}), False),
+    "list_posts_summary": (lambda s: ("GET", f"/posts/?page={s.rng.randint(1, 20)}&limit=20&view=summary", {}), False),
+    "list_posts_by_tag": (lambda s: ("GET", f"/posts/?tag={s.tag()}&limit=10", {}), False),
+    "search_posts": (lambda s: ("GET", f"/posts/search?q={s.rng.choice(['database', 'cache index', 'async thread'])}", {}), False),
+    "read_post": (lambda s: ("GET", f"/posts/{s.post_id()}", {}), False),
+    "related_posts": (lambda s: ("GET", f"/posts/{s.post_id()}/related", {}), False),
+    "list_tags": (lambda s: ("GET", "/tags/", {}), False),
+    "export_posts": (_export_posts, False),
+    "read_user": (lambda s: ("GET", f"/users/{s.user_id()}", {}), False),
+    "read_user_posts": (lambda s: ("GET", f"/users/{s.user_id()}/posts?limit=10", {}), False),
+    "read_users_me": (lambda s: ("GET", "/users/me", {"headers": s.auth}), False),
+    "update_users_me": (lambda s: ("PATCH", "/users/me", {"json": {"avatar": f"a{s.rng.random()}"}, "headers": s.auth}), False),
+    "create_post": (_create_post, False),
+    "import_posts": (_import_posts, False),
+    "update_post": (_update_post, False),
+    "bulk_update_posts": (_bulk_update_posts, False),
+    "delete_post": (_delete_post, False),
+    "bulk_delete_posts": (_bulk_delete_posts, False),
+    "metrics": (lambda s: ("GET", "/metrics/", {}), False),
+    "login": (_login, True),
+    "register": (_register, True),
+}
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _timed_request(client, method: str, url: str, kwargs: Dict[str, Any]):
+    counter = [0]
+    token = _query_counter.set(counter)
+    start = perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    finally:
+        elapsed = perf_counter() - start
+        _query_counter.reset(token)
+    return elapsed, response, counter[0]
+
+
+def _add_own_posts(state: State, count: int) -> None:
+    """Give the bulk scenarios enough posts of their own, outside the timing."""
+    from app.core.database import get_sessionmaker
+    from app.crud.post import import_posts
+    from app.schemas.post import PostCreate
+
+    # The benchmark logs in as the first user
+    posts = [PostCreate(**_post_body(state)) for _ in range(count)]
+    with get_sessionmaker()() as db:
+        state.own_posts.extend(import_posts(db, posts, state.dataset.user_ids[0]))
+
+
+async def run_scenario(client, state: State, name: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    build, _ = SCENARIOS[name]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    queries: List[int] = []
+    statuses: Dict[str, int] = {}
+
+    async def one():
+        async with semaphore:
+            method, url, kwargs = build(state)
+            elapsed, response, query_count = await _timed_request(client, method, url, kwargs)
+            latencies.append(elapsed)
+            queries.append(query_count)
+            status = str(response.status_code)
+            statuses[status] = statuses.get(status, 0) + 1
+            if name == "create_post" and response.status_code == 201:
+                # Later update/delete scenarios work on these
+                state.own_posts.append(response.json()["id"])
+
+    start = perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = perf_counter() - start
+
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "requests": requests,
+        "errors": errors,
+        "status_codes": statuses,
+        "throughput_rps": round(requests / wall, 2),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p95": round(_percentile(latencies, 95) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2),
+            "max": max(queries),
+        },
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--content-median", type=int, default=4000, help="median post body size in bytes")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse an already seeded database")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--auth-requests", type=int, default=20, help="requests for Argon2-bound login/register")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", help="comma separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--async-db", action="store_true", help="run with DATABASE_ASYNC enabled")
+    parser.add_argument("--no-response-cache", action="store_true")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def _configure_environment(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so this must run before importing app
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    # Every request comes from one client, so auth throttling would skew results
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("METRICS_ENABLED", "true")
+    os.environ["DATABASE_ASYNC"] = "true" if args.async_db else "false"
+    if args.no_response_cache:
+        os.environ["RESPONSE_CACHE_MAX_SIZE"] = "0"
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from sqlalchemy import event
+
+    from app.core.config import settings
+    from app.core.database import async_engine, engine
+    from app.main import app
+    from benchmarks.dataset import BENCH_PASSWORD, DatasetConfig, load_dataset, seed_database
+
+    config = DatasetConfig(
+        users=args.users, posts=args.posts, tags=args.tags,
+        content_median=args.content_median, seed=args.seed,
+    )
+    seed_start = perf_counter()
+    dataset = load_dataset(engine, config) if args.skip_seed else seed_database(engine, config)
+    seed_seconds = perf_counter() - seed_start
+
+    def count_query(*_):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    if async_engine is not None:
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_query)
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    state = State(dataset=dataset, rng=random.Random(args.seed))
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=f"http://bench{settings.API_V1_STR}") as client:
+        login = await client.post("/auth/login", data={"username": dataset.usernames[0], "password": BENCH_PASSWORD})
+        login.raise_for_status()
+        state.token = login.json()["access_token"]
+
+        for name in names:
+            requests = args.auth_requests if SCENARIOS[name][1] else args.requests
+            if name == "update_post" and not state.own_posts:
+                print(f"skipping {name}: run create_post first", file=sys.stderr)
+                continue
+            if name == "delete_post":
+                requests = min(requests, len(state.own_posts))
+                if not requests:
+                    print(f"skipping {name}: run create_post first", file=sys.stderr)
+                    continue
+            if name == "bulk_update_posts" and len(state.own_posts) < BULK_POSTS:
+                _add_own_posts(state, BULK_POSTS - len(state.own_posts))
+            if name == "bulk_delete_posts" and len(state.own_posts) < requests * BULK_POSTS:
+                _add_own_posts(state, requests * BULK_POSTS - len(state.own_posts))
+            results[name] = await run_scenario(client, state, name, requests, args.concurrency)
+            print(_format_row(name, results[name]), file=sys.stderr)
+
+    return {
+        "meta": {
+            "git_revision": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "async_db": bool(args.async_db),
+            "response_cache": not args.no_response_cache,
+            "concurrency": args.concurrency,
+            "dataset": asdict(config),
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "scenarios": results,
+    }
+
+
+def _format_row(name: str, result: Dict[str, Any]) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{name:<20} {result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {latency['p50']:>8.2f}  p95 {latency['p95']:>8.2f}  p99 {latency['p99']:>8.2f} ms  "
+        f"{result['queries_per_request']['mean']:>5.1f} q/req  errors {result['errors']}"
+    )
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    _configure_environment(args)
+    report = asyncio.run(_run(args))
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Time the ways a PostList of ORM rows can be turned into a response body.
+
+No database is involved: the posts are transient ORM objects, so only
+validation and encoding are measured.
+
+    cd backend
+    python -m benchmarks.serialization --items 100
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+
+def _build_page(items: int, content_size: int, seed: int) -> Dict[str, Any]:
+    from app.models.post import Post, Tag
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    authors = [
+        User(id=f"user-{i}", username=f"user{i}", email=f"user{i}@example.com", is_active=True, created_at=now)
+        for i in range(10)
+    ]
+    tags = [Tag(name=f"tag{i}", post_count=0) for i in range(20)]
+    posts = []
+    for i in range(items):
+        content = " ".join("lorem" for _ in range(content_size // 6))
+        posts.append(Post(
+            id=f"post-{i}", title=f"Post {i}", content=content, excerpt=content[:150] + "...",
+            published_at=now, updated_at=now, author_id=authors[i % 10].id,
+            author=authors[i % 10], tags=rng.sample(tags, 3),
+        ))
+    return {"items": posts, "total": items, "page": 1, "size": items, "pages": 1}
+
+
+def _strategies(page: Dict[str, Any]) -> Dict[str, Callable[[], bytes]]:
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from app.schemas.adapters import dump_json
+    from app.schemas.post import PostList
+
+    adapter = TypeAdapter(PostList)
+    return {
+        # FastAPI before the pydantic-core fast path, and with any custom
+        # response_class today: validate, build a dict, then json.dumps it
+        "jsonable_encoder+JSONResponse": lambda: JSONResponse(
+            jsonable_encoder(PostList.model_validate(page))
+        ).body,
+        "dump_python+JSONResponse": lambda: JSONResponse(
+            adapter.dump_python(adapter.validate_python(page, from_attributes=True), mode="json")
+        ).body,
+        "dump_python+orjson": lambda: orjson.dumps(
+            adapter.dump_python(adapter.validate_python(page, from_attributes=True), mode="json")
+        ),
+        # Validate once, let pydantic-core write JSON bytes directly
+        "TypeAdapter.dump_json": lambda: dump_json(PostList, page),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--content-size", type=int, default=4000, help="post body size in bytes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50, help="calls per timing")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    page = _build_page(args.items, args.content_size, args.seed)
+    strategies = _strategies(page)
+
+    bodies = {name: json.loads(fn()) for name, fn in strategies.items()}
+    reference = next(iter(bodies.values()))
+    if any(body != reference for body in bodies.values()):
+        raise SystemExit("strategies produced different JSON")
+
+    results: List[Any] = []
+    for name, fn in strategies.items():
+        best = min(timeit.repeat(fn, repeat=args.repeat, number=args.number)) / args.number
+        results.append((name, best * 1000))
+
+    baseline = results[0][1]
+    print(f"PostList of {args.items} posts, {args.content_size} byte bodies", file=sys.stderr)
+    for name, ms in results:
+        print(f"{name:<32} {ms:>8.3f} ms  {baseline / ms:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
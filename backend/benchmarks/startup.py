@@ -0,0 +1,197 @@
+"""Measure cold-start cost: import time, startup and first-request latency.
+
+Every sample runs in a fresh interpreter, so nothing is warm from an earlier
+one. Each sample imports ``app.main``, optionally runs the lifespan startup,
+then sends the first and second request for a few route shapes:
+
+    cd backend
+    python -m benchmarks.startup --runs 5 --warm-connections 4 --output startup.json
+
+Variants:
+
+    lazy      no lifespan events, as on servers that skip them; the first
+              request builds the engine and opens its connection
+    lifespan  lifespan startup with warm-up disabled (engine and mappers only)
+    warm      lifespan startup with --warm-connections pooled connections and
+              the password hasher pre-warmed
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = ("lazy", "lifespan", "warm")
+
+# Requested in this order; each one is sent twice (first, then warm)
+ROUTES = ("list_posts", "read_post", "login")
+
+
+async def _child(config: Dict[str, Any]) -> Dict[str, Any]:
+    start = perf_counter()
+    from app.main import app
+    import_ms = (perf_counter() - start) * 1000
+
+    import httpx
+    from benchmarks.dataset import BENCH_PASSWORD
+
+    requests = {
+        "list_posts": ("GET", "/api/v1/posts/?limit=10", {}),
+        "read_post": ("GET", f"/api/v1/posts/{config['post_id']}", {}),
+        "login": ("POST", "/api/v1/auth/login", {"data": {"username": config["username"], "password": BENCH_PASSWORD}}),
+    }
+
+    async def measure(client) -> Dict[str, Any]:
+        timings: Dict[str, Any] = {}
+        for name in ROUTES:
+            method, url, kwargs = requests[name]
+            samples = []
+            for _ in range(2):
+                begin = perf_counter()
+                response = await client.request(method, url, **kwargs)
+                samples.append((perf_counter() - begin) * 1000)
+                response.raise_for_status()
+            timings[name] = {"first_ms": samples[0], "second_ms": samples[1]}
+        return timings
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        if config["variant"] == "lazy":
+            return {"import_ms": import_ms, "startup_ms": 0.0, "routes": await measure(client)}
+        begin = perf_counter()
+        async with app.router.lifespan_context(app):
+            startup_ms = (perf_counter() - begin) * 1000
+            routes = await measure(client)
+        return {"import_ms": import_ms, "startup_ms": startup_ms, "routes": routes}
+
+
+def _sample(variant: str, args: argparse.Namespace, post_id: str, username: str) -> Dict[str, Any]:
+    env = dict(os.environ, **_environment(args))
+    env["DATABASE_WARM_CONNECTIONS"] = str(args.warm_connections if variant == "warm" else 0)
+    env["PASSWORD_HASH_PREWARM"] = "true" if variant == "warm" else "false"
+    config = {"variant": variant, "post_id": post_id, "username": username}
+    begin = perf_counter()
+    output = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.startup", "--child", json.dumps(config)],
+        cwd=BACKEND_DIR, env=env, text=True,
+    )
+    result = json.loads(output)
+    # Interpreter start, imports, startup and all requests
+    result["process_ms"] = (perf_counter() - begin) * 1000
+    return result
+
+
+def _median(samples: List[Dict[str, Any]], get) -> float:
+    return round(statistics.median(get(sample) for sample in samples), 2)
+
+
+def _summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "process_ms": _median(samples, lambda s: s["process_ms"]),
+        "import_ms": _median(samples, lambda s: s["import_ms"]),
+        "startup_ms": _median(samples, lambda s: s["startup_ms"]),
+        "routes": {},
+    }
+    for name in ROUTES:
+        summary["routes"][name] = {
+            key: _median(samples, lambda s: s["routes"][name][key])
+            for key in ("first_ms", "second_ms")
+        }
+    return summary
+
+
+def _environment(args: argparse.Namespace) -> Dict[str, str]:
+    return {
+        "DATABASE_URL": args.database_url,
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret"),
+        "RATE_LIMIT_ENABLED": "false",
+        "DATABASE_ASYNC": "true" if args.async_db else "false",
+        # Keep the per-sample startup log line out of the results
+        "LOG_LEVEL": "WARNING",
+    }
+
+
+def _format_row(name: str, result: Dict[str, Any]) -> str:
+    routes = "  ".join(
+        f"{route} {timing['first_ms']:>7.1f}/{timing['second_ms']:<6.1f}"
+        for route, timing in result["routes"].items()
+    )
+    return (
+        f"{name:<9} process {result['process_ms']:>7.1f}  import {result['import_ms']:>7.1f}  "
+        f"startup {result['startup_ms']:>7.1f}  first/second ms: {routes}"
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", "sqlite:///./bench_startup.db"))
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse an already seeded database")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per variant")
+    parser.add_argument("--warm-connections", type=int, default=4)
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="comma separated subset of: " + ", ".join(VARIANTS))
+    parser.add_argument("--async-db", action="store_true", help="run with DATABASE_ASYNC enabled")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(asyncio.run(_child(json.loads(args.child)))))
+        return
+
+    variants = args.variants.split(",")
+    unknown = [name for name in variants if name not in VARIANTS]
+    if unknown:
+        raise SystemExit(f"Unknown variants: {', '.join(unknown)}")
+
+    # Settings are read at import time, so this must run before importing app
+    os.environ.update(_environment(args))
+    from app.core.database import get_engine
+    from benchmarks.dataset import DatasetConfig, load_dataset, seed_database
+
+    config = DatasetConfig(posts=args.posts)
+    engine = get_engine()
+    dataset = load_dataset(engine, config) if args.skip_seed else seed_database(engine, config)
+    engine.dispose()
+
+    results: Dict[str, Any] = {}
+    for variant in variants:
+        samples = [
+            _sample(variant, args, dataset.post_ids[0], dataset.usernames[0])
+            for _ in range(args.runs)
+        ]
+        results[variant] = _summarize(samples)
+        print(_format_row(variant, results[variant]), file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "async_db": bool(args.async_db),
+            "runs": args.runs,
+            "warm_connections": args.warm_connections,
+        },
+        "variants": results,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
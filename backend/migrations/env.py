@@ -7,6 +7,7 @@ from sqlalchemy import pool
 from app.models.user import User
 from app.models.post import Post  
 from app.models.post import Tag  # Import Tag mode
+from app.models.job import OutboxJob
 from app.core.database import Base  # Import Base instead of SQLModel
 from app.core.config import settings  # Import settings to get DATABASE_URL
 
@@ -0,0 +1,30 @@
+"""add post keyset pagination indexes
+
+Revision ID: 7c1e5a9d3b42
+Revises: 4922d8a045da
+Create Date: 2026-10-18 09:12:05.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d3b42'
+down_revision: Union[str, None] = '4922d8a045da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_posts_published_at_id', 'posts', ['published_at', 'id'], unique=False)
+    op.create_index('ix_posts_author_id_published_at_id', 'posts', ['author_id', 'published_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_author_id_published_at_id', table_name='posts')
+    op.drop_index('ix_posts_published_at_id', table_name='posts')
@@ -0,0 +1,84 @@
+"""add post full text search
+
+Revision ID: a3f9c2e81d57
+Revises: 7c1e5a9d3b42
+Create Date: 2026-10-18 11:40:27.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2e81d57'
+down_revision: Union[str, None] = '7c1e5a9d3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A copy of the DDL in app.models.post as of this revision, so later edits
+# to the model don't change what this migration does
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE posts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE posts_fts USING fts5(
+        title, excerpt, content, content='posts', content_rowid='rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, excerpt, content)
+        VALUES (new.rowid, new.title, new.excerpt, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.rowid, old.title, old.excerpt, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, excerpt, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.rowid, old.title, old.excerpt, old.content);
+        INSERT INTO posts_fts(rowid, title, excerpt, content)
+        VALUES (new.rowid, new.title, new.excerpt, new.content);
+    END
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # The generated column is computed for existing rows on creation
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index('ix_posts_search_vector', table_name='posts')
+        op.drop_column('posts', 'search_vector')
+    elif dialect == "sqlite":
+        for trigger in ("posts_fts_ai", "posts_fts_ad", "posts_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS posts_fts")
@@ -0,0 +1,32 @@
+"""add post excerpt_derived
+
+Revision ID: b2e7d4a9c6f3
+Revises: f1b6d8a3c7e2
+Create Date: 2026-10-18 22:31:05.118420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e7d4a9c6f3'
+down_revision: Union[str, None] = 'f1b6d8a3c7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing rows stay NULL (worked out from the content when next edited)
+    until ``python -m app.cli.backfill_content`` fills them in.
+    """
+    op.add_column('posts', sa.Column('excerpt_derived', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'excerpt_derived')
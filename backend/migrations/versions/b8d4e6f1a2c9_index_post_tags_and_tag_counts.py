@@ -0,0 +1,56 @@
+"""index post_tags and add tag post counts
+
+Revision ID: b8d4e6f1a2c9
+Revises: a3f9c2e81d57
+Create Date: 2026-10-18 13:05:48.204377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4e6f1a2c9'
+down_revision: Union[str, None] = 'a3f9c2e81d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # post_tags never had a key, so clear out rows the primary key would reject
+    op.execute("DELETE FROM post_tags WHERE post_id IS NULL OR tag_name IS NULL")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "DELETE FROM post_tags a USING post_tags b "
+            "WHERE a.ctid < b.ctid AND a.post_id = b.post_id AND a.tag_name = b.tag_name"
+        )
+    else:
+        op.execute(
+            "DELETE FROM post_tags WHERE rowid NOT IN "
+            "(SELECT min(rowid) FROM post_tags GROUP BY post_id, tag_name)"
+        )
+
+    with op.batch_alter_table('post_tags') as batch_op:
+        batch_op.alter_column('post_id', existing_type=sa.String(), nullable=False)
+        batch_op.alter_column('tag_name', existing_type=sa.String(), nullable=False)
+        batch_op.create_primary_key('pk_post_tags', ['post_id', 'tag_name'])
+    op.create_index('ix_post_tags_tag_name_post_id', 'post_tags', ['tag_name', 'post_id'], unique=False)
+
+    op.add_column('tags', sa.Column('post_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        "UPDATE tags SET post_count = "
+        "(SELECT count(*) FROM post_tags WHERE post_tags.tag_name = tags.name)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tags', 'post_count')
+    op.drop_index('ix_post_tags_tag_name_post_id', table_name='post_tags')
+    with op.batch_alter_table('post_tags') as batch_op:
+        batch_op.drop_constraint('pk_post_tags', type_='primary')
+        batch_op.alter_column('tag_name', existing_type=sa.String(), nullable=True)
+        batch_op.alter_column('post_id', existing_type=sa.String(), nullable=True)
@@ -0,0 +1,32 @@
+"""add user post count
+
+Revision ID: c5e2a7b9d013
+Revises: b8d4e6f1a2c9
+Create Date: 2026-10-18 14:22:10.671045
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a7b9d013'
+down_revision: Union[str, None] = 'b8d4e6f1a2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('post_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        "UPDATE users SET post_count = "
+        "(SELECT count(*) FROM posts WHERE posts.author_id = users.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'post_count')
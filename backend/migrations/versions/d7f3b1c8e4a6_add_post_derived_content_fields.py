@@ -0,0 +1,36 @@
+"""add post derived content fields
+
+Revision ID: d7f3b1c8e4a6
+Revises: c5e2a7b9d013
+Create Date: 2026-10-18 20:41:37.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b1c8e4a6'
+down_revision: Union[str, None] = 'c5e2a7b9d013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing rows are filled in by ``python -m app.cli.backfill_content``,
+    which renders markdown in Python and so can't run as SQL here.
+    """
+    op.add_column('posts', sa.Column('content_html', sa.Text(), nullable=True))
+    op.add_column('posts', sa.Column('word_count', sa.Integer(), nullable=True))
+    op.add_column('posts', sa.Column('reading_time_minutes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'reading_time_minutes')
+    op.drop_column('posts', 'word_count')
+    op.drop_column('posts', 'content_html')
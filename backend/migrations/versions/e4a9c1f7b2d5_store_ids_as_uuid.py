@@ -0,0 +1,129 @@
+"""store user and post ids as uuid
+
+Revision ID: e4a9c1f7b2d5
+Revises: d7f3b1c8e4a6
+Create Date: 2026-10-18 21:12:05.517840
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import UUIDString
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c1f7b2d5'
+down_revision: Union[str, None] = 'd7f3b1c8e4a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Every column holding a user or post id, referenced tables first
+ID_COLUMNS = [
+    ('users', 'id'),
+    ('posts', 'id'),
+    ('posts', 'author_id'),
+    ('post_tags', 'post_id'),
+]
+
+# Postgres' default names for the constraints created by earlier revisions
+FOREIGN_KEYS = [
+    ('posts_author_id_fkey', 'posts', 'users', 'author_id', 'id'),
+    ('post_tags_post_id_fkey', 'post_tags', 'posts', 'post_id', 'id'),
+]
+
+SQLITE_FTS_TRIGGERS = ("posts_fts_ai", "posts_fts_ad", "posts_fts_au")
+
+# The search triggers as added by a3f9c2e81d57, recreated after the rebuild
+SQLITE_FTS_TRIGGER_DDL = [
+    """
+    CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, excerpt, content)
+        VALUES (new.rowid, new.title, new.excerpt, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.rowid, old.title, old.excerpt, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, excerpt, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.rowid, old.title, old.excerpt, old.content);
+        INSERT INTO posts_fts(rowid, title, excerpt, content)
+        VALUES (new.rowid, new.title, new.excerpt, new.content);
+    END
+    """,
+]
+
+
+def _convert_sqlite_values(to_bytes: bool) -> None:
+    """Rewrite every id between its text and 16-byte forms, row by row.
+
+    SQLite stores whatever it is given regardless of the declared type, so
+    values are converted here and the tables are then rebuilt with the new
+    declared type around them.
+    """
+    bind = op.get_bind()
+    for table, column in ID_COLUMNS:
+        values = bind.execute(sa.text(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")).scalars().all()
+        params = []
+        for value in values:
+            if to_bytes and isinstance(value, str):
+                params.append({"old": value, "new": uuid.UUID(value).bytes})
+            elif not to_bytes and isinstance(value, bytes):
+                params.append({"old": value, "new": str(uuid.UUID(bytes=value))})
+        if params:
+            bind.execute(sa.text(f"UPDATE {table} SET {column} = :new WHERE {column} = :old"), params)
+
+
+def _rebuild_sqlite_tables(type_) -> None:
+    # Recreating posts drops its search triggers and renumbers its rowids, so
+    # the FTS table is re-indexed from scratch afterwards
+    for trigger in SQLITE_FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    for table in ('users', 'posts', 'post_tags'):
+        with op.batch_alter_table(table, recreate='always') as batch_op:
+            for name, column in ID_COLUMNS:
+                if name == table:
+                    batch_op.alter_column(column, type_=type_)
+    for statement in SQLITE_FTS_TRIGGER_DDL:
+        op.execute(statement)
+    op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def _alter_postgres_columns(type_: str) -> None:
+    for name, table, *_ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+    for table, column in ID_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_} USING {column}::{type_}")
+    for name, table, referent, local, remote in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referent, [local], [remote])
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Existing uuid4 ids keep their value; only their storage changes. New ids
+    are generated as time-ordered UUIDv7 by the application.
+    """
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _alter_postgres_columns("uuid")
+    elif dialect == "sqlite":
+        _convert_sqlite_values(to_bytes=True)
+        _rebuild_sqlite_tables(UUIDString())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        _alter_postgres_columns("varchar")
+    elif dialect == "sqlite":
+        _convert_sqlite_values(to_bytes=False)
+        _rebuild_sqlite_tables(sa.String())
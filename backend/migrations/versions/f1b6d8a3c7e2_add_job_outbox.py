@@ -0,0 +1,43 @@
+"""add job outbox
+
+Revision ID: f1b6d8a3c7e2
+Revises: e4a9c1f7b2d5
+Create Date: 2026-10-18 22:03:44.910352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import UUIDString
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d8a3c7e2'
+down_revision: Union[str, None] = 'e4a9c1f7b2d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_outbox',
+    sa.Column('id', UUIDString(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_outbox_status_run_at', 'job_outbox', ['status', 'run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_outbox_status_run_at', table_name='job_outbox')
+    op.drop_table('job_outbox')
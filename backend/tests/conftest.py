@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import, so point the app at a throwaway database first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("SECRET_KEY", "test")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    # The app imports every model, so the metadata is complete
+    from app.core.database import Base, get_engine
+    import app.main  # noqa: F401
+
+    Base.metadata.create_all(bind=get_engine())
@@ -0,0 +1,51 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.database import get_sessionmaker
+from app.core.security import create_access_token
+from app.crud.post import create_post
+from app.crud.user import create_user
+from app.main import app
+from app.schemas.post import PostCreate
+from app.schemas.user import UserCreate
+
+_exporters = itertools.count()
+
+
+@pytest.fixture
+def exporter():
+    name = f"exporter{next(_exporters)}"
+    with get_sessionmaker()() as db:
+        user = create_user(
+            db, UserCreate(username=name, email=f"{name}@example.com", password="password1"),
+            hashed_password="unused",
+        )
+        for i in range(3):
+            create_post(db, PostCreate(title=f"Export {i}", content="body"), user_id=user.id)
+    token = create_access_token({"sub": user.username, "id": user.id})
+    return {"Authorization": f"Bearer {token}"}, user.id
+
+
+def test_export_requires_a_login():
+    assert TestClient(app).get("/api/v1/posts/export").status_code == 401
+
+
+def test_export_stops_at_the_row_cap(exporter, monkeypatch):
+    headers, user_id = exporter
+    monkeypatch.setattr(settings, "EXPORT_MAX_ROWS", 2)
+    response = TestClient(app).get(f"/api/v1/posts/export?author={user_id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 2
+
+
+def test_exports_are_rate_limited_per_user(exporter):
+    headers, user_id = exporter
+    client = TestClient(app)
+    statuses = [
+        client.get(f"/api/v1/posts/export?author={user_id}", headers=headers).status_code
+        for _ in range(settings.EXPORT_RATE_LIMIT_BURST + 1)
+    ]
+    assert statuses == [200] * settings.EXPORT_RATE_LIMIT_BURST + [429]
@@ -0,0 +1,75 @@
+import asyncio
+import itertools
+import json
+import time
+
+import httpx
+import pytest
+
+from app.core.database import get_async_db, get_async_read_db, get_db, get_read_db, get_sessionmaker
+from app.core.security import create_access_token
+from app.crud.user import create_user
+from app.main import app
+from app.schemas.user import UserCreate
+
+PARAGRAPH = "Some *markdown* with a [link](https://example.com), `code` and **bold** text. " * 8
+
+_importers = itertools.count()
+
+
+@pytest.fixture(params=["sync", "async"])
+def session_mode(request):
+    if request.param == "async":
+        # What DATABASE_ASYNC=true wires the routes to
+        app.dependency_overrides[get_db] = get_async_db
+        app.dependency_overrides[get_read_db] = get_async_read_db
+    yield request.param
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def auth_headers():
+    name = f"importer{next(_importers)}"
+    with get_sessionmaker()() as db:
+        user = create_user(
+            db, UserCreate(username=name, email=f"{name}@example.com", password="password1"),
+            hashed_password="unused",
+        )
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.username, 'id': user.id})}"}
+
+
+async def _ping_during_import(body: bytes, headers: dict):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        done = asyncio.Event()
+        latencies = []
+
+        async def ping():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/")
+                latencies.append(time.perf_counter() - start)
+
+        async def run_import():
+            start = time.perf_counter()
+            try:
+                return await client.post("/api/v1/posts/import", content=body, headers=headers), time.perf_counter() - start
+            finally:
+                done.set()
+
+        (response, elapsed), _ = await asyncio.gather(run_import(), ping())
+        return response, elapsed, latencies
+
+
+def test_ping_is_answered_during_a_large_import(session_mode, auth_headers):
+    # One batch of posts with ~30 KB bodies: rendering them takes around a
+    # second, all of which would be one stall if it ran on the event loop
+    content = ("# Section\n\n" + PARAGRAPH + "\n\n") * 45
+    body = "\n".join(json.dumps({"title": f"Large {i}", "content": content}) for i in range(12)).encode()
+
+    response, elapsed, latencies = asyncio.run(_ping_during_import(body, auth_headers))
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 12
+    assert len(latencies) >= 10
+    assert max(latencies) < elapsed / 4
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import get_sessionmaker
+from app.core.jobs import FAILED, PENDING, job_queue
+from app.crud.post import import_posts, refresh_post_statistics
+from app.crud.user import create_user
+from app.models.job import OutboxJob
+from app.schemas.post import PostCreate
+from app.schemas.user import UserCreate
+
+STATISTICS_JOB = f"{refresh_post_statistics.__module__}.{refresh_post_statistics.__qualname__}"
+
+ran = []
+
+
+@job_queue.job("tests.record")
+def record(db, payload):
+    ran.append(payload)
+
+
+@job_queue.job("tests.broken", max_attempts=2)
+def broken(db, payload):
+    raise RuntimeError("broken")
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    # Keep the workers and the poller out of it: jobs are run by hand here
+    job_queue.shutdown()
+    ids = []
+    monkeypatch.setattr(job_queue, "_submit", ids.append)
+    ran.clear()
+    with get_sessionmaker()() as db:
+        db.query(OutboxJob).filter(OutboxJob.name.startswith("tests.")).delete()
+        db.commit()
+    yield ids
+    job_queue._stopping.clear()
+
+
+def _job(job_id):
+    with get_sessionmaker()() as db:
+        return db.get(OutboxJob, job_id)
+
+
+def _enqueue(name, payload=None, **kwargs):
+    with get_sessionmaker()() as db:
+        job_id = job_queue.enqueue(db, name, payload or {}, **kwargs)
+        db.commit()
+    return job_id
+
+
+def test_job_is_queued_only_once_its_transaction_commits(submitted):
+    with get_sessionmaker()() as db:
+        job_id = job_queue.enqueue(db, "tests.record", {"n": 1})
+        db.flush()
+        assert _job(job_id) is None
+        assert submitted == []
+        db.commit()
+    assert submitted == [job_id]
+    assert _job(job_id).status == PENDING
+
+
+def test_rolled_back_job_is_dropped(submitted):
+    with get_sessionmaker()() as db:
+        job_id = job_queue.enqueue(db, "tests.record", {})
+        db.flush()
+        db.rollback()
+        # The next transaction on the session doesn't carry it along
+        db.commit()
+    assert submitted == []
+    assert _job(job_id) is None
+
+
+def test_delayed_job_is_left_to_the_poller(submitted):
+    job_id = _enqueue("tests.record", delay=60)
+    assert submitted == []
+    job_queue._run(job_id)
+    assert ran == []
+
+
+def test_claim_holds_a_lease_until_it_runs_out(submitted):
+    job_id = _enqueue("tests.record")
+    with get_sessionmaker()() as db:
+        name, payload, attempts, _, _ = job_queue._claim(db, job_id)
+        assert (name, attempts) == ("tests.record", 1)
+        # Another worker can't take it while the lease lasts
+        assert job_queue._claim(db, job_id) is None
+
+        # ...but can once it has run out, as after a crash
+        db.query(OutboxJob).filter_by(id=job_id).update({"locked_until": datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+        assert job_queue._claim(db, job_id)[2] == 2
+
+
+def test_finished_job_is_deleted(submitted):
+    job_id = _enqueue("tests.record", {"n": 2})
+    job_queue._run(job_id)
+    assert ran == [{"n": 2}]
+    assert _job(job_id) is None
+    # At most once per claim: running it again finds nothing
+    job_queue._run(job_id)
+    assert ran == [{"n": 2}]
+
+
+def test_failing_job_is_retried_then_kept_as_failed(submitted):
+    job_id = _enqueue("tests.broken")
+    job_queue._run(job_id)
+    job = _job(job_id)
+    assert (job.status, job.attempts, job.locked_until) == (PENDING, 1, None)
+    assert job.last_error == "RuntimeError: broken"
+    assert job.run_at > datetime.utcnow()
+
+    # Not before its backoff is up
+    job_queue._run(job_id)
+    assert _job(job_id).attempts == 1
+
+    with get_sessionmaker()() as db:
+        db.query(OutboxJob).filter_by(id=job_id).update({"run_at": datetime.utcnow()})
+        db.commit()
+    job_queue._run(job_id)
+    job = _job(job_id)
+    assert (job.status, job.attempts) == (FAILED, 2)
+
+
+def test_debounced_jobs_coalesce_until_one_starts(submitted):
+    first = _enqueue("tests.record", {"batch": 1}, debounce=60)
+    assert _enqueue("tests.record", {"batch": 2}, debounce=60) == first
+    with get_sessionmaker()() as db:
+        assert db.query(OutboxJob).filter_by(name="tests.record", status=PENDING).count() == 1
+        assert db.get(OutboxJob, first).payload == {"batch": 1}
+        db.query(OutboxJob).filter_by(id=first).update({"run_at": datetime.utcnow()})
+        db.commit()
+        job_queue._claim(db, first)
+    # One that is already running doesn't absorb later events
+    assert _enqueue("tests.record", {"batch": 3}, debounce=60) != first
+
+
+def test_import_batches_share_one_statistics_refresh(submitted):
+    with get_sessionmaker()() as db:
+        user = create_user(
+            db, UserCreate(username="jobsimporter", email="jobsimporter@example.com", password="password1"),
+            hashed_password="unused",
+        )
+        for batch in range(3):
+            import_posts(db, [PostCreate(title=f"Batch {batch}", content="body")], user.id)
+        pending = db.query(OutboxJob).filter_by(name=STATISTICS_JOB, status=PENDING).all()
+    assert len(pending) == 1
+    assert pending[0].run_at > datetime.utcnow()
+    assert submitted == []
@@ -0,0 +1,82 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.crud.post as crud_post
+from app.core.database import get_sessionmaker
+from app.core.security import create_access_token
+from app.crud.user import create_user
+from app.main import app
+from app.models.post import Post
+from app.schemas.user import UserCreate
+
+_authors = itertools.count()
+
+
+@pytest.fixture
+def client_and_headers():
+    name = f"excerpts{next(_authors)}"
+    with get_sessionmaker()() as db:
+        user = create_user(
+            db, UserCreate(username=name, email=f"{name}@example.com", password="password1"),
+            hashed_password="unused",
+        )
+    token = create_access_token({"sub": user.username, "id": user.id})
+    return TestClient(app), {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    render = crud_post.render_content
+
+    def counting_render(content):
+        calls.append(content)
+        return render(content)
+
+    monkeypatch.setattr(crud_post, "render_content", counting_render)
+    return calls
+
+
+def _create(client, headers, **fields):
+    response = client.post("/api/v1/posts/", json={"title": "Excerpts", "content": "First body", **fields}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_derived_excerpt_follows_the_content(client_and_headers, renders):
+    client, headers = client_and_headers
+    post_id = _create(client, headers)
+    renders.clear()
+    response = client.patch(f"/api/v1/posts/{post_id}", json={"content": "Second body"}, headers=headers)
+    assert response.json()["excerpt"] == "Second body"
+    # Only the new body is rendered, not the old one as well
+    assert renders == ["Second body"]
+
+
+def test_written_excerpt_survives_a_content_edit(client_and_headers, renders):
+    client, headers = client_and_headers
+    post_id = _create(client, headers, excerpt="Hand written")
+    renders.clear()
+    response = client.patch(f"/api/v1/posts/{post_id}", json={"content": "Second body"}, headers=headers)
+    assert response.json()["excerpt"] == "Hand written"
+    assert renders == ["Second body"]
+
+    # Clearing it hands the excerpt back to the content
+    response = client.patch(f"/api/v1/posts/{post_id}", json={"excerpt": None}, headers=headers)
+    response = client.patch(f"/api/v1/posts/{post_id}", json={"content": "Third body"}, headers=headers)
+    assert response.json()["excerpt"] == "Third body"
+
+
+def test_rows_without_the_flag_fall_back_to_comparing(client_and_headers):
+    client, headers = client_and_headers
+    derived_id = _create(client, headers)
+    written_id = _create(client, headers, excerpt="Hand written")
+    with get_sessionmaker()() as db:
+        # As left by the migration for existing rows
+        db.query(Post).filter(Post.id.in_([derived_id, written_id])).update({"excerpt_derived": None})
+        db.commit()
+    for post_id, expected in ((derived_id, "Second body"), (written_id, "Hand written")):
+        response = client.patch(f"/api/v1/posts/{post_id}", json={"content": "Second body"}, headers=headers)
+        assert response.json()["excerpt"] == expected
@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_sessionmaker
+from app.core.security import create_access_token
+from app.crud.post import create_post
+from app.crud.user import create_user
+from app.main import app
+from app.schemas.post import PostCreate
+from app.schemas.user import UserCreate
+
+_authors = itertools.count()
+
+
+@pytest.fixture
+def author():
+    name = f"idauthor{next(_authors)}"
+    with get_sessionmaker()() as db:
+        user = create_user(
+            db, UserCreate(username=name, email=f"{name}@ids.example.com", password="password1"),
+            hashed_password="unused",
+        )
+        post_ids = [
+            create_post(db, PostCreate(title=f"Id {i}", content="body", tags=["ids", f"ids{i}"]), user_id=user.id).id
+            for i in range(3)
+        ]
+    token = create_access_token({"sub": user.username, "id": user.id})
+    return {"Authorization": f"Bearer {token}"}, user.id, post_ids
+
+
+def _variants(post_id):
+    # Spellings of the same UUID a client might send
+    return [post_id.upper(), "{" + post_id + "}", post_id.replace("-", "")]
+
+
+def test_reads_accept_any_uuid_spelling(author):
+    _, user_id, post_ids = author
+    client = TestClient(app)
+    for post_id in _variants(post_ids[0]):
+        response = client.get(f"/api/v1/posts/{post_id}")
+        assert response.status_code == 200
+        assert response.json()["id"] == post_ids[0]
+        related = client.get(f"/api/v1/posts/{post_id}/related").json()
+        assert {post["id"] for post in related} == set(post_ids[1:])
+    assert client.get(f"/api/v1/users/{user_id.upper()}/posts").json()["total"] == 3
+    assert client.get("/api/v1/posts/not-a-uuid").status_code == 404
+
+
+def test_bulk_operations_report_canonical_ids(author):
+    headers, _, post_ids = author
+    client = TestClient(app)
+    ids = [post_ids[0].upper(), "{" + post_ids[1] + "}", "not-a-uuid"]
+    response = client.post("/api/v1/posts/bulk-update", json={"ids": ids, "add_tags": ["bulk"]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": post_ids[0], "status": "updated"},
+        {"id": post_ids[1], "status": "updated"},
+        {"id": "not-a-uuid", "status": "not_found"},
+    ]
+    response = client.post("/api/v1/posts/bulk-delete", json={"ids": [post_ids[2].upper()]}, headers=headers)
+    assert response.json()["results"] == [{"id": post_ids[2], "status": "deleted"}]
+    assert client.get(f"/api/v1/posts/{post_ids[2]}").status_code == 404
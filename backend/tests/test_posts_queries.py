@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import get_engine, get_sessionmaker
+from app.crud.post import create_post
+from app.crud.user import create_user
+from app.main import app
+from app.schemas.post import PostCreate
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture(scope="module")
+def post_ids():
+    ids = []
+    with get_sessionmaker()() as db:
+        # A different author and tag set per post, so lazy loading would
+        # cost a query per row
+        for i in range(25):
+            user = create_user(
+                db, UserCreate(username=f"author{i}", email=f"author{i}@example.com", password="password1"),
+                hashed_password="unused",
+            )
+            post = create_post(
+                db, PostCreate(title=f"Post {i}", content="word " * 50, tags=[f"tag{i}", f"tag{i % 3}"]),
+                user_id=user.id,
+            )
+            ids.append(post.id)
+    return ids
+
+
+@pytest.fixture
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+# The page itself plus, with selectin, one query each for authors and tags
+PAGE_QUERIES = {"selectin": 3, "joined": 1}
+
+
+def _queries(client, count_queries, url, params=None):
+    # Every request has to reach the database to be counted
+    response_cache.invalidate()
+    count_queries.clear()
+    response = client.get(url, params=params)
+    assert response.status_code == 200, response.text
+    return len(count_queries)
+
+
+@pytest.mark.parametrize("strategy", ["selectin", "joined"])
+@pytest.mark.parametrize("params", [{}, {"cursor": ""}, {"view": "summary"}])
+def test_post_list_query_count_is_independent_of_page_size(monkeypatch, post_ids, count_queries, strategy, params):
+    monkeypatch.setattr(settings, "POST_LOADER_STRATEGY", strategy)
+    client = TestClient(app)
+    small = _queries(client, count_queries, "/api/v1/posts/", {**params, "limit": 1})
+    large = _queries(client, count_queries, "/api/v1/posts/", {**params, "limit": 20})
+    # Offset pages also count the total
+    expected = PAGE_QUERIES[strategy] + (0 if "cursor" in params else 1)
+    assert small == large == expected
+
+
+@pytest.mark.parametrize("strategy", ["selectin", "joined"])
+def test_single_post_query_count(monkeypatch, post_ids, count_queries, strategy):
+    monkeypatch.setattr(settings, "POST_LOADER_STRATEGY", strategy)
+    client = TestClient(app)
+    assert _queries(client, count_queries, f"/api/v1/posts/{post_ids[0]}") == PAGE_QUERIES[strategy]
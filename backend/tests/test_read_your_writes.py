@@ -0,0 +1,56 @@
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.cache import ResponseCache
+from app.core.config import settings
+from app.core.replicas import ReadYourWritesMiddleware, reads_pinned_to_primary, record_write
+
+
+async def read(request):
+    return JSONResponse({"pinned": reads_pinned_to_primary()})
+
+
+async def write(request):
+    record_write()
+    return JSONResponse({})
+
+
+def _client():
+    app = Starlette(routes=[Route("/read", read), Route("/write", write, methods=["POST"])])
+    app.add_middleware(ReadYourWritesMiddleware)
+    return TestClient(app)
+
+
+def test_write_response_tells_the_client_to_read_from_the_primary():
+    client = _client()
+    response = client.post("/write")
+    assert response.headers["X-Read-Primary-For"] == str(settings.DATABASE_REPLICA_STICKY_SECONDS)
+    # Nothing is carried by cookies, which a cross-site fetch wouldn't send
+    assert "set-cookie" not in response.headers
+    assert "X-Read-Primary-For" not in client.get("/read").headers
+
+
+def test_reads_are_pinned_only_while_the_header_is_sent():
+    client = _client()
+    assert client.get("/read").json() == {"pinned": False}
+    assert client.get("/read", headers={"X-Read-Primary": "1"}).json() == {"pinned": True}
+
+
+def test_replica_reads_are_not_cached_right_after_a_write():
+    cache = ResponseCache(maxsize=8, ttl=60, replica_lag=60)
+    cache.invalidate()
+    generation = cache.generation
+
+    cache.set("replica", generation, "stale", from_replica=True)
+    cache.set("primary", generation, "fresh")
+    assert cache.get("replica") is None
+    assert cache.get("primary") == "fresh"
+
+
+def test_replica_reads_are_cached_once_the_lag_has_passed():
+    cache = ResponseCache(maxsize=8, ttl=60, replica_lag=0)
+    cache.invalidate()
+    cache.set("replica", cache.generation, "body", from_replica=True)
+    assert cache.get("replica") == "body"
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+from app.core.instrumentation import route_metrics
+from app.main import app
+
+
+def test_routes_are_labelled_by_template():
+    # Only the labels matter here, not whether the handlers succeed
+    client = TestClient(app, raise_server_exceptions=False)
+    # Parameter values that look like static segments or the prefix
+    client.get("/api/v1/posts/search/related")
+    client.get("/api/v1/posts/posts")
+    client.get("/api/v1/users/v1/posts")
+    client.get("/api/v1/posts/search", params={"q": "x"})
+    client.get("/api/v1/nowhere")
+    routes = route_metrics.snapshot()
+    assert routes["GET /api/v1/posts/{post_id}/related"]["count"] >= 1
+    assert routes["GET /api/v1/posts/{post_id}"]["count"] >= 1
+    assert routes["GET /api/v1/users/{user_id}/posts"]["count"] >= 1
+    assert routes["GET /api/v1/posts/search"]["count"] >= 1
+    assert routes["GET <unmatched>"]["count"] >= 1
+    assert not [route for route in routes if "search" in route and "{" in route]
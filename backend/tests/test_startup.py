@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+import app.api.related as related
+from app.core.jobs import job_queue
+from app.main import app
+
+
+def test_startup_does_no_work_that_grows_with_the_data(monkeypatch):
+    work = []
+
+    async def rebuild():
+        work.append("related index")
+
+    monkeypatch.setattr(related, "_rebuild", rebuild)
+    monkeypatch.setattr(job_queue, "start", lambda: work.append("job workers"))
+    monkeypatch.setattr(job_queue, "resume", lambda: work.append("outbox check"))
+
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
+    # The outbox check is deferred until after startup and cancelled here
+    assert work == []
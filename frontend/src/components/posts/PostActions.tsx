@@ -20,6 +20,7 @@ import {
   AlertDialogTitle,
 } from '@/components/ui/alert-dialog';
 import { API_URL } from '@/config/api';
+import { apiFetch } from '@/services/api';
 
 interface PostActionsProps {
   postId: string;
@@ -37,7 +38,7 @@ export const PostActions = ({ postId, onDelete }: PostActionsProps) => {
     try {
       // Use the correct URL with /api/v1/
       const token = localStorage.getItem('token');
-      const response = await fetch(`${API_URL}/posts/${postId}`, {
+      const response = await apiFetch(`${API_URL}/posts/${postId}`, {
         method: 'DELETE',
         headers: {
           'Authorization': `Bearer ${token}`,
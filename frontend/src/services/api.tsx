@@ -10,6 +10,24 @@ const api = axios.create({
   }
 });
 
+// Read-your-writes: after a write the API answers with X-Read-Primary-For
+// (seconds). Until that runs out, requests carry X-Read-Primary so the API
+// reads from its primary database instead of a replica that may lag behind.
+const READ_PRIMARY_KEY = 'readPrimaryUntil';
+
+export const apiFetch = async (input: string, init: RequestInit = {}) => {
+  const headers = new Headers(init.headers);
+  if (Date.now() < Number(sessionStorage.getItem(READ_PRIMARY_KEY))) {
+    headers.set('X-Read-Primary', '1');
+  }
+  const response = await fetch(input, { ...init, headers });
+  const seconds = Number(response.headers.get('X-Read-Primary-For'));
+  if (seconds > 0) {
+    sessionStorage.setItem(READ_PRIMARY_KEY, String(Date.now() + seconds * 1000));
+  }
+  return response;
+};
+
 // Types
 export interface Post {
   id: string;
@@ -59,7 +77,7 @@ export const fetchPosts = async (page = 1, limit = 10, userId?: string) => {
       url += `&author_id=${userId}`;
     }
     
-    const response = await fetch(url);
+    const response = await apiFetch(url);
     
     if (!response.ok) {
       const error = await response.json();
@@ -75,7 +93,7 @@ export const fetchPosts = async (page = 1, limit = 10, userId?: string) => {
 // Fetch a single post by ID
 export const fetchPost = async (id: string) => {
   try {
-    const response = await fetch(`${API_URL}/posts/${id}`);
+    const response = await apiFetch(`${API_URL}/posts/${id}`);
     
     if (!response.ok) {
       const error = await response.json();
@@ -97,7 +115,7 @@ export const createPost = async (postData: CreatePostData) => {
   }
   
   try {
-    const response = await fetch(`${API_URL}/posts`, {
+    const response = await apiFetch(`${API_URL}/posts`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -126,7 +144,7 @@ export const updatePost = async (postId: string, postData: UpdatePostData) => {
   }
   
   try {
-    const response = await fetch(`${API_URL}/posts/${postId}`, {
+    const response = await apiFetch(`${API_URL}/posts/${postId}`, {
       method: 'PATCH',
       headers: {
         'Content-Type': 'application/json',
@@ -149,7 +167,7 @@ export const updatePost = async (postId: string, postData: UpdatePostData) => {
 // Fetch user profile
 export const fetchUserProfile = async (userId: string) => {
   try {
-    const response = await fetch(`${API_URL}/users/${userId}`);
+    const response = await apiFetch(`${API_URL}/users/${userId}`);
     
     if (!response.ok) {
       const error = await response.json();
@@ -170,7 +188,7 @@ export const deletePost = async (postId: string) => {
     throw new Error('Authentication required');
   }
   
-  const response = await fetch(`${API_URL}/posts/${postId}`, {
+  const response = await apiFetch(`${API_URL}/posts/${postId}`, {
     method: 'DELETE',
     headers: {
       'Authorization': `Bearer ${token}`,
@@ -202,7 +220,7 @@ export const deletePost = async (postId: string) => {
 // Add this function to fetch posts for a specific user
 export const fetchUserPosts = async (userId: string, page: number = 1, limit: number = 10) => {
   try {
-    const response = await fetch(`${API_URL}/users/${userId}/posts?page=${page}&limit=${limit}`);
+    const response = await apiFetch(`${API_URL}/users/${userId}/posts?page=${page}&limit=${limit}`);
     
     if (!response.ok) {
       const error = await response.json();